@@ -3,7 +3,7 @@ from __future__ import annotations
 import csv
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Mapping
 from types import MappingProxyType
 import threading
 
@@ -77,13 +77,13 @@ def _normalize_priority_selections(
 
     return normalized
 
-_PRIORITY_FILE_CACHE: dict[str, tuple[int, dict[tuple[str, str, str], int]]] = {}
+_PRIORITY_FILE_CACHE: dict[str, tuple[int, Mapping[tuple[str, str, str], int]]] = {}
 _PRIORITY_CACHE_LOCK = threading.Lock()
 
 
 def _load_morph_priorities_from_file(
     priority_file_name: str,
-) -> dict[tuple[str, str, str], int]:
+) -> Mapping[tuple[str, str, str], int]:
     assert mw is not None
     priority_file_path = Path(
         mw.pm.profileFolder(),
@@ -110,13 +110,13 @@ def _load_morph_priorities_from_file(
     except FileNotFoundError as exc:
         raise PriorityFileNotFoundException(str(priority_file_path)) from exc
 
+    # the cached priorities are shared between calls, so callers only ever
+    # get the read-only view and never the dict backing it
+    read_only_priorities = MappingProxyType(priorities)
     with _PRIORITY_CACHE_LOCK:
-        _PRIORITY_FILE_CACHE[priority_file_name] = (
-            mtime_ns,
-            MappingProxyType(priorities),
-        )
+        _PRIORITY_FILE_CACHE[priority_file_name] = (mtime_ns, read_only_priorities)
 
-    return priorities
+    return read_only_priorities
 
 
 def _parse_headers(
@@ -129,23 +129,21 @@ def _parse_headers(
             reason='Priority file does not have headers.',
         )
 
-    if ps_globals.LEMMA_HEADER not in headers:
+    # one pass over the headers instead of a scan for every column, the first
+    # occurrence of a header wins like it does with list.index
+    header_indices: dict[str, int] = {}
+    for index, header in enumerate(headers):
+        header_indices.setdefault(header, index)
+
+    lemma_index = header_indices.get(ps_globals.LEMMA_HEADER)
+    if lemma_index is None:
         raise PriorityFileMalformedException(
             path=str(priority_file_path),
             reason=f"Priority file is missing the '{ps_globals.LEMMA_HEADER}' header",
         )
 
-    lemma_index = headers.index(ps_globals.LEMMA_HEADER)
-    reading_index = (
-        headers.index(ps_globals.READING_HEADER)
-        if ps_globals.READING_HEADER in headers
-        else None
-    )
-    priority_index = (
-        headers.index(ps_globals.LEMMA_PRIORITY_HEADER)
-        if ps_globals.LEMMA_PRIORITY_HEADER in headers
-        else None
-    )
+    reading_index = header_indices.get(ps_globals.READING_HEADER)
+    priority_index = header_indices.get(ps_globals.LEMMA_PRIORITY_HEADER)
 
     return PriorityFileMeta(
         lemma_index=lemma_index,
@@ -161,23 +159,33 @@ def _extract_priorities(
 ) -> dict[tuple[str, str, str], int]:
     priorities: dict[tuple[str, str, str], int] = {}
 
+    # the header indices are read once instead of on every row
+    lemma_index = meta.lemma_index
+    reading_index = meta.reading_index
+    priority_index = meta.priority_index
+
+    # without a priority column the row index is the priority, which only
+    # grows, so the first occurrence of a key is always the lowest one
+    keep_first = priority_index is None
+
     for index, row in enumerate(morph_reader):
-        if meta.lemma_index >= len(row):
+        row_length = len(row)
+        if lemma_index >= row_length:
             raise PriorityFileMalformedException(
                 path=str(source_path),
                 reason='Row is missing lemma column.',
             )
 
-        lemma = row[meta.lemma_index].strip()
-        reading = ''
-        if meta.reading_index is not None and meta.reading_index < len(row):
-            reading = normalize_reading(row[meta.reading_index])
-
+        lemma = row[lemma_index].strip()
         if not lemma:
             continue
 
-        if meta.priority_index is not None and meta.priority_index < len(row):
-            priority_str = row[meta.priority_index].strip()
+        reading = ''
+        if reading_index is not None and reading_index < row_length:
+            reading = normalize_reading(row[reading_index])
+
+        if priority_index is not None and priority_index < row_length:
+            priority_str = row[priority_index].strip()
             if not priority_str:
                 raise PriorityFileMalformedException(
                     path=str(source_path),
@@ -194,6 +202,12 @@ def _extract_priorities(
             priority = index
 
         key = (lemma, lemma, reading)
+        if keep_first:
+            priorities.setdefault(key, priority)
+            if reading:
+                priorities.setdefault((lemma, lemma, ''), priority)
+            continue
+
         existing = priorities.get(key)
         if existing is None or priority < existing:
             priorities[key] = priority
@@ -209,8 +223,13 @@ def _extract_priorities(
 
 def _merge_priorities(
     target: dict[tuple[str, str, str], int],
-    source: dict[tuple[str, str, str], int],
+    source: Mapping[tuple[str, str, str], int],
 ) -> None:
+    # the first source has nothing to compare against, so it is copied as is
+    if not target:
+        target.update(source)
+        return
+
     for key, priority in source.items():
         existing = target.get(key)
         if existing is None or priority < existing:
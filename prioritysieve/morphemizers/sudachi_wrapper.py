@@ -6,13 +6,14 @@ import subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 try:  # pragma: no cover - imported lazily in tests
     from aqt.package import venv_binary
 except ImportError:  # pragma: no cover - falls back during tests
     venv_binary = None  # type: ignore[assignment]
 
+from ..exceptions import CancelledOperationException
 from ..morpheme import Morpheme
 
 SUDACHI_DICTIONARY_VARIANTS = ["small", "core", "full"]
@@ -38,6 +39,12 @@ _last_error: str | None = None
 
 _packages_path_override: Path | None = None
 
+# how often a running pip install checks whether it should be cancelled
+_CANCEL_POLL_INTERVAL_SECONDS = 0.2
+
+# (packages path, directory modification time, installed variants)
+_installed_variants_cache: tuple[Path, int, list[str]] | None = None
+
 _POS_BLACKLIST = {
     "補助記号",  # punctuation and auxiliary symbols
     "記号",  # symbols
@@ -60,6 +67,7 @@ def invalidate_cache() -> None:
     global _sudachi_tokenizer_module
     global _modules_imported
     global successful_import
+    global _installed_variants_cache
 
     _tokenizer_cache = {}
     _last_error = None
@@ -67,6 +75,7 @@ def invalidate_cache() -> None:
     _sudachi_tokenizer_module = None
     _modules_imported = False
     successful_import = False
+    _installed_variants_cache = None
 
 
 def ensure_tokenizer(dict_variant: str | None, split_mode: str) -> bool:
@@ -157,8 +166,8 @@ def get_last_error() -> str | None:
     return _last_error
 
 
-def install_sudachipy() -> None:
-    _install_packages(["sudachipy"])
+def install_sudachipy(should_cancel: Callable[[], bool] | None = None) -> None:
+    _install_packages(["sudachipy"], should_cancel)
     invalidate_cache()
 
 
@@ -177,12 +186,14 @@ def uninstall_sudachipy() -> None:
     invalidate_cache()
 
 
-def install_dictionary(variant: str) -> None:
+def install_dictionary(
+    variant: str, should_cancel: Callable[[], bool] | None = None
+) -> None:
     if variant not in _DICTIONARY_PACKAGE_MAP:
         raise ValueError(f"Unsupported Sudachi dictionary variant: {variant}")
 
     pip_name, _module_name = _DICTIONARY_PACKAGE_MAP[variant]
-    _install_packages([pip_name])
+    _install_packages([pip_name], should_cancel)
     invalidate_cache()
 
 
@@ -209,10 +220,21 @@ def remove_dictionary(variant: str) -> None:
 
 
 def list_installed_dictionary_variants() -> list[str]:
+    global _installed_variants_cache
+
     packages_path = _get_packages_path()
-    if not packages_path.exists():
+    try:
+        packages_mtime = packages_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
 
+    # installing or removing a package changes the mtime of the directory,
+    # so the listing only has to be redone when that happens
+    if _installed_variants_cache is not None:
+        cached_path, cached_mtime, cached_variants = _installed_variants_cache
+        if cached_path == packages_path and cached_mtime == packages_mtime:
+            return list(cached_variants)
+
     installed: set[str] = set()
     existing_entries = {entry.name for entry in packages_path.iterdir()}
 
@@ -226,7 +248,9 @@ def list_installed_dictionary_variants() -> list[str]:
         ):
             installed.add(variant)
 
-    return sorted(installed)
+    installed_variants = sorted(installed)
+    _installed_variants_cache = (packages_path, packages_mtime, installed_variants)
+    return list(installed_variants)
 
 
 def is_sudachipy_installed() -> bool:
@@ -318,7 +342,9 @@ def _import_sudachi_modules(force: bool = False) -> None:
     successful_import = True
 
 
-def _install_packages(packages: list[str]) -> None:
+def _install_packages(
+    packages: list[str], should_cancel: Callable[[], bool] | None = None
+) -> None:
     python_binary = _get_python_binary()
     packages_path = _get_packages_path()
     packages_path.mkdir(parents=True, exist_ok=True)
@@ -336,7 +362,26 @@ def _install_packages(packages: list[str]) -> None:
     if testing_environment:
         return
 
-    subprocess.run(command, check=True)
+    if should_cancel is None:
+        subprocess.run(command, check=True)
+        return
+
+    # The dictionaries are large downloads, so the pip process is polled
+    # and terminated if the user cancels the install.
+    with subprocess.Popen(command) as process:
+        while True:
+            try:
+                return_code = process.wait(timeout=_CANCEL_POLL_INTERVAL_SECONDS)
+            except subprocess.TimeoutExpired:
+                if should_cancel():
+                    process.terminate()
+                    process.wait()
+                    raise CancelledOperationException from None
+                continue
+
+            if return_code != 0:
+                raise subprocess.CalledProcessError(return_code, command)
+            return
 
 
 def _get_python_binary() -> str:
@@ -1,29 +1,26 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
 from .morph_priority_utils import get_morph_priority
 from .reading_utils import normalize_reading
 
 if TYPE_CHECKING:  # pragma: no cover - import cycle guard for type checkers only
-    from .morpheme import Morpheme
     from .prioritysieve_db import PrioritySieveDB
 
 
 def _build_existing_priority_keys(
-    card_morph_map_cache: dict[int, list[Morpheme]],
+    card_lemmas_and_readings: set[tuple[str, str | None]],
 ) -> tuple[set[tuple[str, str, str]], set[str]]:
     """Return the exact morph keys and lemma-only lookup for existing cards."""
 
-    exact_keys: set[tuple[str, str, str]] = set()
-    lemma_only: set[str] = set()
-
-    for morphs in card_morph_map_cache.values():
-        for morph in morphs:
-            reading = normalize_reading(morph.reading)
-            exact_keys.add((morph.lemma, morph.lemma, reading))
-            lemma_only.add(morph.lemma)
+    exact_keys: set[tuple[str, str, str]] = {
+        (lemma, lemma, normalize_reading(reading))
+        for lemma, reading in card_lemmas_and_readings
+    }
+    lemma_only: set[str] = {lemma for lemma, _ in card_lemmas_and_readings}
 
     return exact_keys, lemma_only
 
@@ -38,8 +35,9 @@ def find_missing_priority_entries(
     if not priority_map:
         return []
 
-    card_morph_map_cache = am_db.get_card_morph_map_cache()
-    exact_keys, lemma_only = _build_existing_priority_keys(card_morph_map_cache)
+    exact_keys, lemma_only = _build_existing_priority_keys(
+        am_db.get_card_morph_lemmas_and_readings()
+    )
 
     lemma_details: dict[str, dict[str, dict[str, int] | int | None]] = {}
 
@@ -85,17 +83,7 @@ def find_missing_priority_entries(
         ):
             missing_entries.append((lemma, "", fallback_priority))
 
-    missing_entries.sort(key=lambda entry: (entry[2], entry[0], entry[1]))
-
-    lemmas_with_readings = {lemma for lemma, reading, _ in missing_entries if reading}
-
-    deduped: list[tuple[str, str, int]] = []
-    for lemma, reading, priority in missing_entries:
-        if reading:
-            deduped.append((lemma, reading, priority))
-            continue
-
-        if lemma not in lemmas_with_readings:
-            deduped.append((lemma, reading, priority))
-
-    return deduped
+    # a lemma only gets a reading-less entry when it has no reading entries,
+    # so the sorted list needs no further deduplication
+    missing_entries.sort(key=itemgetter(2, 0, 1))
+    return missing_entries
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import functools
 import sqlite3
+import sys
 from collections import Counter
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import Any
 
@@ -28,6 +29,29 @@ def _escape_sql(value: str) -> str:
     return value.replace("'", "''")
 
 
+def _get_am_cards_where_clause(
+    note_type_id: NotetypeId | None,
+    include_tags: str,
+    exclude_tags: str,
+) -> tuple[str, tuple[Any, ...]]:
+    assert note_type_id is not None
+
+    where_sql = "note_type_id = ?"
+    params: list[Any] = [note_type_id]
+
+    if len(include_tags) > 0:
+        required_conditions = " AND ".join(["tags LIKE ?"] * len(include_tags))
+        where_sql += f" AND {required_conditions}"
+        params.extend([f"% {tag} %" for tag in include_tags])
+
+    if len(exclude_tags) > 0:
+        excluded_conditions = " AND ".join(["tags NOT LIKE ?"] * len(exclude_tags))
+        where_sql += f" AND {excluded_conditions}"
+        params.extend([f"% {tag} %" for tag in exclude_tags])
+
+    return where_sql, tuple(params)
+
+
 class PrioritySieveDB:  # pylint:disable=too-many-public-methods
     # A card can have many morphs, morphs can be on many cards,
     # therefore, we need a many-to-many db structure:
@@ -37,14 +61,19 @@ class PrioritySieveDB:  # pylint:disable=too-many-public-methods
         """
         db_path is used for swapping dbs during testing
         """
-        assert mw is not None
-        assert mw.pm is not None
-
         if db_path is None:
-            db_path = Path(mw.pm.profileFolder(), "prioritysieve.db")
+            db_path = PrioritySieveDB.get_default_db_path()
 
+        self.db_path: Path = db_path
         self.con: sqlite3.Connection = sqlite3.connect(db_path)
 
+    @staticmethod
+    def get_default_db_path() -> Path:
+        assert mw is not None
+        assert mw.pm is not None
+
+        return Path(mw.pm.profileFolder(), "prioritysieve.db")
+
     def __enter__(self) -> PrioritySieveDB:
         """
         Creates a context manager
@@ -119,6 +148,13 @@ class PrioritySieveDB:  # pylint:disable=too-many-public-methods
                     )
                     """
             )
+            # covers the toolbar stats query, so it doesn't have to scan the table
+            self.con.execute(
+                """
+                    CREATE INDEX IF NOT EXISTS idx_morphs_interval_lemma
+                    ON Morphs(highest_inflection_learning_interval, lemma)
+                    """
+            )
 
     def create_seen_morph_table(self) -> None:
         with self.con:
@@ -193,6 +229,12 @@ class PrioritySieveDB:  # pylint:disable=too-many-public-methods
                 card_morph_list,
             )
 
+    def update_query_statistics(self) -> None:
+        # gives the query planner row counts for the join in
+        # get_card_morph_map_cache after the tables were filled in bulk
+        with self.con:
+            self.con.execute("ANALYZE")
+
     def get_readable_card_morphs(self, card_id: int) -> list[tuple[str, str, str]]:
         card_morphs: list[tuple[str, str, str]] = []
 
@@ -502,13 +544,17 @@ class PrioritySieveDB:  # pylint:disable=too-many-public-methods
             """,
         ).fetchall()
 
+        # sqlite returns new string objects for every row, so the same morph on
+        # many cards would keep its own copies of the strings without interning
+        intern = sys.intern
+
         for row in card_morph_map_cache_raw:
             card_id = row[0]
             reading_value = _normalize_reading(row[3])
             morph = Morpheme(
-                lemma=row[1],
-                inflection=row[2],
-                reading=reading_value if reading_value else None,
+                lemma=intern(row[1]),
+                inflection=intern(row[2]),
+                reading=intern(reading_value) if reading_value else None,
                 highest_lemma_learning_interval=row[4],
                 highest_inflection_learning_interval=row[5],
             )
@@ -520,41 +566,66 @@ class PrioritySieveDB:  # pylint:disable=too-many-public-methods
 
         return card_morph_map_cache
 
-    def get_am_cards_data_dict(
+    def get_card_morph_lemmas_and_readings(self) -> set[tuple[str, str | None]]:
+        # only the distinct pairs are needed to tell which morphs have cards,
+        # so sqlite dedupes them instead of a Morpheme being built per row.
+        # the readings are returned as stored, the caller normalizes them
+        lemmas_and_readings: list[tuple[str, str | None]] = self.con.execute(
+            """
+            SELECT DISTINCT Morphs.lemma, Morphs.reading
+            FROM Card_Morph_Map
+            INNER JOIN Morphs ON
+                Card_Morph_Map.morph_lemma = Morphs.lemma
+                AND Card_Morph_Map.morph_inflection = Morphs.inflection
+                AND Card_Morph_Map.morph_reading = Morphs.reading
+            """,
+        ).fetchall()
+
+        return set(lemmas_and_readings)
+
+    def get_am_cards_count(
         self,
         note_type_id: NotetypeId | None,
         include_tags: str,  # whitespace separated string
         exclude_tags: str,  # whitespace separated string
-    ) -> dict[CardId, PrioritySieveCardData]:
-        assert mw is not None
-        assert mw.col.db is not None
-        assert note_type_id is not None
+    ) -> int:
+        where_sql, params = _get_am_cards_where_clause(
+            note_type_id, include_tags, exclude_tags
+        )
+        result = self.con.execute(
+            f"SELECT COUNT(*) FROM Cards WHERE {where_sql}", params
+        ).fetchone()
+        return int(result[0]) if result is not None else 0
 
-        query = """
+    def get_am_cards_data_iter(
+        self,
+        note_type_id: NotetypeId | None,
+        include_tags: str,  # whitespace separated string
+        exclude_tags: str,  # whitespace separated string
+        batch_size: int = 1000,
+    ) -> Iterator[PrioritySieveCardData]:
+        """
+        Yields the cards in primary-key order without materializing the
+        whole result set, which keeps memory usage flat on large collections.
+        """
+        where_sql, params = _get_am_cards_where_clause(
+            note_type_id, include_tags, exclude_tags
+        )
+        cursor = self.con.execute(
+            f"""
             SELECT card_id, note_id, note_type_id, card_type, tags
             FROM Cards
-            WHERE note_type_id = ?
-        """
-
-        params: list[Any] = [note_type_id]
-
-        if len(include_tags) > 0:
-            required_conditions = " AND ".join(["tags LIKE ?"] * len(include_tags))
-            query += f" AND {required_conditions}"
-            params.extend([f"% {tag} %" for tag in include_tags])
-
-        if len(exclude_tags) > 0:
-            excluded_conditions = " AND ".join(["tags NOT LIKE ?"] * len(exclude_tags))
-            query += f" AND {excluded_conditions}"
-            params.extend([f"% {tag} %" for tag in exclude_tags])
-
-        result = self.con.execute(query, tuple(params)).fetchall()
-
-        am_db_row_data_dict: dict[CardId, PrioritySieveCardData] = {}
-        for am_data in map(PrioritySieveCardData, result):
-            am_db_row_data_dict[am_data.card_id] = am_data
+            WHERE {where_sql}
+            ORDER BY card_id
+            """,
+            params,
+        )
 
-        return am_db_row_data_dict
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from map(PrioritySieveCardData, rows)
 
     # the cache needs to have a max size to maintain garbage collection
     @functools.lru_cache(maxsize=131072)
@@ -2,12 +2,20 @@ from __future__ import annotations
 
 import re
 
+# ヷ-ヺ have no hiragana counterpart, shifting them would give combining marks
 _KATAKANA_TO_HIRAGANA = str.maketrans(
-    {chr(code_point): chr(code_point - 0x60) for code_point in range(ord("ァ"), ord("ヺ") + 1)}
+    {chr(code_point): chr(code_point - 0x60) for code_point in range(ord("ァ"), ord("ヶ") + 1)}
 )
 
 _WHITESPACE_RE = re.compile(r"\s+")
 
+# a token runs until whitespace outside of brackets, whitespace inside a
+# reading such as 持[も]っ[　]て is kept, and an unclosed bracket runs to the
+# next bracket or the end of the text
+_FURIGANA_TOKEN_RE = re.compile(r"(?:[^\s\[]|\[[^\[\]]*\]?)+")
+# the regex can't track nested brackets, those fields are split by depth
+_NESTED_BRACKETS_RE = re.compile(r"\[[^\]]*\[")
+
 
 def _is_hiragana(char: str) -> bool:
     return "\u3041" <= char <= "\u309f"
@@ -134,19 +142,12 @@ def strip_furigana_token(token: str) -> str:
     return "".join(result)
 
 
-def parse_furigana_field(field_text: str) -> list[str]:
-    stripped_text = field_text.strip()
-    if not stripped_text:
-        return []
-
-    if "[" not in stripped_text:
-        return [normalize_reading(stripped_text)]
-
+def _split_nested_furigana_tokens(text: str) -> list[str]:
     tokens: list[str] = []
     current: list[str] = []
     depth = 0
 
-    for char in stripped_text:
+    for char in text:
         if char == "[":
             depth += 1
             current.append(char)
@@ -167,6 +168,23 @@ def parse_furigana_field(field_text: str) -> list[str]:
     if current:
         tokens.append("".join(current))
 
+    return tokens
+
+
+def parse_furigana_field(field_text: str) -> list[str]:
+    stripped_text = field_text.strip()
+    if not stripped_text:
+        return []
+
+    if "[" not in stripped_text:
+        return [normalize_reading(stripped_text)]
+
+    tokens: list[str]
+    if _NESTED_BRACKETS_RE.search(stripped_text):
+        tokens = _split_nested_furigana_tokens(stripped_text)
+    else:
+        tokens = _FURIGANA_TOKEN_RE.findall(stripped_text)
+
     readings: list[str] = []
     for token in tokens:
         stripped = strip_furigana_token(token).strip()
@@ -122,11 +122,12 @@ def cache_anki_data(  # pylint:disable=too-many-locals, too-many-branches, too-m
                 continue
 
             for morph in card_data.morphs:
+                morph_reading = normalize_reading(morph.reading)
                 morph_table_data.append(
                     {
                         "lemma": morph.lemma,
                         "inflection": morph.inflection,
-                        "reading": normalize_reading(morph.reading),
+                        "reading": morph_reading,
                         "highest_lemma_learning_interval": None,  # updates later
                         "highest_inflection_learning_interval": highest_interval,
                     }
@@ -136,7 +137,7 @@ def cache_anki_data(  # pylint:disable=too-many-locals, too-many-branches, too-m
                         "card_id": card_id,
                         "morph_lemma": morph.lemma,
                         "morph_inflection": morph.inflection,
-                        "morph_reading": normalize_reading(morph.reading),
+                        "morph_reading": morph_reading,
                     }
                 )
 
@@ -151,6 +152,7 @@ def cache_anki_data(  # pylint:disable=too-many-locals, too-many-branches, too-m
     am_db.insert_many_into_morph_table(morph_table_data)
     am_db.insert_many_into_card_table(card_table_data)
     am_db.insert_many_into_card_morph_map_table(card_morph_map_table_data)
+    am_db.update_query_statistics()
     # am_db.print_table("Morphs")
     am_db.con.close()
 
@@ -164,11 +166,11 @@ def _assign_readings_to_morphs(
     if not processed_morphs:
         return processed_morphs
 
-    furigana_tokens = (
-        parse_furigana_field(card_data.furigana)
-        if card_data.furigana
-        else []
-    )
+    furigana = card_data.furigana
+    reading = card_data.reading
+    expression = card_data.expression
+
+    furigana_tokens = parse_furigana_field(furigana) if furigana else []
 
     combined_furigana = "".join(furigana_tokens)
     if combined_furigana:
@@ -180,17 +182,17 @@ def _assign_readings_to_morphs(
         furigana_tokens = []
 
     raw_reading_tokens: list[str] = []
-    if card_data.reading:
-        stripped = card_data.reading.strip()
+    if reading:
+        stripped = reading.strip()
         if stripped:
             parts = stripped.split()
             if not parts:
                 parts = [stripped]
-            raw_reading_tokens = [
-                get_processed_text(am_config, part.lower()) for part in parts
-            ]
-            raw_reading_tokens = [normalize_reading(token) for token in raw_reading_tokens]
-            raw_reading_tokens = [token for token in raw_reading_tokens if token]
+            normalized_parts = (
+                normalize_reading(get_processed_text(am_config, part.lower()))
+                for part in parts
+            )
+            raw_reading_tokens = [token for token in normalized_parts if token]
 
     ordered_sources = (
         [raw_reading_tokens, furigana_tokens]
@@ -205,10 +207,10 @@ def _assign_readings_to_morphs(
             break
 
     if not tokens:
-        if len(processed_morphs) == 1 and card_data.expression:
-            fallback = get_processed_text(
-                am_config, card_data.expression.lower()
-            ).strip()
+        if len(processed_morphs) == 1 and expression:
+            fallback = normalize_reading(
+                get_processed_text(am_config, expression.lower()).strip()
+            )
             if fallback:
                 tokens = [fallback]
 
@@ -226,8 +228,9 @@ def _assign_readings_to_morphs(
         else:
             pairs = zip(processed_morphs, tokens)
 
-    for morph, reading in pairs:
-        normalized = normalize_reading(reading)
+    # every token is already normalized, so a shared token is not converted
+    # again for each morph it is assigned to
+    for morph, normalized in pairs:
         if not normalized:
             continue
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import itertools
 import json
 import time
 from pathlib import Path
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 
 from anki.cards import Card, CardId
 from anki.consts import CARD_TYPE_NEW, CardQueue
@@ -47,6 +48,7 @@ _last_modified_cards_count: int = 0
 _last_modified_notes_count: int = 0
 _recent_card_diffs: list[str] = []
 _recent_note_diffs: list[str] = []
+_MAX_RECENT_DIFFS: int = 5
 _followup_sync_callback: Callable[[], None] | None = None
 
 
@@ -54,17 +56,15 @@ def set_followup_sync_callback(callback: Callable[[], None] | None) -> None:
     global _followup_sync_callback
     _followup_sync_callback = callback
 
+def _get_stripped_tags(tags: list[str]) -> list[str]:
+    # every tag is only stripped once, both for the check and the result
+    stripped_tags = (tag.strip() for tag in tags if isinstance(tag, str))
+    return sorted(tag for tag in stripped_tags if tag)
+
+
 def _get_filter_identifier(config_filter: PrioritySieveConfigFilter) -> str:
-    include_tags = sorted(
-        tag.strip()
-        for tag in config_filter.tags.get("include", [])
-        if isinstance(tag, str) and tag.strip()
-    )
-    exclude_tags = sorted(
-        tag.strip()
-        for tag in config_filter.tags.get("exclude", [])
-        if isinstance(tag, str) and tag.strip()
-    )
+    include_tags = _get_stripped_tags(config_filter.tags.get("include", []))
+    exclude_tags = _get_stripped_tags(config_filter.tags.get("exclude", []))
 
     return "|".join(
         (
@@ -166,9 +166,9 @@ def _filters_requiring_state_snapshot() -> list[PrioritySieveConfigFilter]:
     # mutate their cards. We also include 'read'-only filters so changes in the
     # underlying collection trigger cache rebuilds for users that disabled the
     # modify option (e.g., to avoid extra-field writes).
-    combined_filters = (
-        prioritysieve_config.get_modify_enabled_filters()
-        + prioritysieve_config.get_read_enabled_filters()
+    combined_filters = itertools.chain(
+        prioritysieve_config.get_modify_enabled_filters(),
+        prioritysieve_config.get_read_enabled_filters(),
     )
 
     unique_filters: list[PrioritySieveConfigFilter] = []
@@ -346,6 +346,14 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
 
     auto_suspended_tag = am_config.tag_suspended_automatically
 
+    # bind the module attributes once, they are used on every card below
+    suspended = tags_and_queue_utils.suspended
+    update_new_card = tags_and_queue_utils.update_tags_and_queue_of_new_card
+    update_review_card = tags_and_queue_utils.update_tags_of_review_cards
+    background_update_progress = (
+        progress_utils.background_update_progress_potentially_cancel
+    )
+
     for config_filter in modify_enabled_config_filters:
         note_type_dict: NotetypeDict = (
             extra_field_utils.potentially_add_extra_fields_to_note_type(
@@ -359,17 +367,21 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
             am_db=am_db,
             morph_priority_selection=config_filter.morph_priority_selections,
         )
-        cards_data_dict: dict[CardId, PrioritySieveCardData] = (
-            am_db.get_am_cards_data_dict(
-                note_type_id=model_manager.id_for_name(config_filter.note_type),
-                include_tags=config_filter.tags["include"],
-                exclude_tags=config_filter.tags["exclude"],
-            )
+        note_type_id = model_manager.id_for_name(config_filter.note_type)
+        card_amount = am_db.get_am_cards_count(
+            note_type_id=note_type_id,
+            include_tags=config_filter.tags["include"],
+            exclude_tags=config_filter.tags["exclude"],
+        )
+        cards_data: Iterator[PrioritySieveCardData] = am_db.get_am_cards_data_iter(
+            note_type_id=note_type_id,
+            include_tags=config_filter.tags["include"],
+            exclude_tags=config_filter.tags["exclude"],
         )
-        card_amount = len(cards_data_dict)
 
-        for counter, card_id in enumerate(cards_data_dict):
-            progress_utils.background_update_progress_potentially_cancel(
+        for counter, card_data in enumerate(cards_data):
+            card_id = card_data.card_id
+            background_update_progress(
                 label=f"Updating {config_filter.note_type} cards<br>card: {counter} of {card_amount}",
                 counter=counter,
                 max_value=card_amount,
@@ -409,7 +421,8 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
                 card_due = compute_due_from_priorities(
                     cards_morph_metrics.all_morphs, morph_priorities
                 )
-                card.due = card_due
+                if card.due != card_due:
+                    card.due = card_due
 
                 unknowns_amount = len(cards_morph_metrics.unknown_morphs)
                 force_auto_suspend = (
@@ -418,7 +431,7 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
                     and card_due == prioritysieve_globals.DEFAULT_REVIEW_DUE
                 )
 
-                tags_and_queue_utils.update_tags_and_queue_of_new_card(
+                update_new_card(
                     am_config=am_config,
                     note=note,
                     card=card,
@@ -427,16 +440,13 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
                     force_auto_suspend=force_auto_suspend,
                 )
             else:
-                tags_and_queue_utils.update_tags_of_review_cards(
+                update_review_card(
                     am_config=am_config,
                     note=note,
                     has_learning_morphs=cards_morph_metrics.has_learning_morphs,
                 )
 
-            if (
-                card.queue != tags_and_queue_utils.suspended
-                and auto_suspended_tag in note.tags
-            ):
+            if card.queue != suspended and auto_suspended_tag in note.tags:
                 note.tags = [
                     tag for tag in note.tags if tag != auto_suspended_tag and tag.strip()
                 ]
@@ -473,32 +483,44 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
     final_modified_cards: dict[CardId, Card] = {}
     final_modified_notes: dict[int, Note] = {}
 
+    # once enough diff samples have been captured we stop formatting them,
+    # the f-strings are surprisingly expensive for notes with large fields
+    card_diffs_full = False
     for card_id, card in modified_cards.items():
         original_due, original_queue = card_original_state.get(
             card_id, (card.due, card.queue)
         )
         if card.due == original_due and card.queue == original_queue:
             continue
-        if len(_recent_card_diffs) < 5:
-            _recent_card_diffs.append(
-                f"card {card_id}: due {original_due}→{card.due}, queue {original_queue}→{card.queue}"
-            )
+        if not card_diffs_full:
+            if len(_recent_card_diffs) < _MAX_RECENT_DIFFS:
+                _recent_card_diffs.append(
+                    f"card {card_id}: due {original_due}→{card.due}, queue {original_queue}→{card.queue}"
+                )
+            else:
+                card_diffs_full = True
         final_modified_cards[card_id] = card
 
+    note_diffs_full = False
     for note_id, note in modified_notes.items():
         original_fields, original_tags = note_original_state.get(
             note_id, (note.fields, note.tags)
         )
-        if original_fields == note.fields and original_tags == note.tags:
+        if original_fields == note.fields and sorted(original_tags) == sorted(
+            note.tags
+        ):
             continue
 
-        if len(_recent_note_diffs) < 5:
-            changes: list[str] = []
-            if original_tags != note.tags:
-                changes.append(f"tags {original_tags}→{note.tags}")
-            if original_fields != note.fields:
-                changes.append(f"fields {original_fields}→{note.fields}")
-            _recent_note_diffs.append(f"note {note_id}: " + "; ".join(changes))
+        if not note_diffs_full:
+            if len(_recent_note_diffs) < _MAX_RECENT_DIFFS:
+                changes: list[str] = []
+                if original_tags != note.tags:
+                    changes.append(f"tags {original_tags}→{note.tags}")
+                if original_fields != note.fields:
+                    changes.append(f"fields {original_fields}→{note.fields}")
+                _recent_note_diffs.append(f"note {note_id}: " + "; ".join(changes))
+            else:
+                note_diffs_full = True
 
         final_modified_notes[note_id] = note
 
@@ -517,6 +539,7 @@ def _update_cards_and_notes(  # pylint:disable=too-many-locals, too-many-stateme
     _last_modified_cards_count = len(final_modified_cards)
     _last_modified_notes_count = len(final_modified_notes)
 
+
 def _add_offsets_to_new_cards(
     am_config: PrioritySieveConfig,
     card_morph_map_cache: dict[int, list[Morpheme]],
@@ -635,11 +658,7 @@ def _apply_offsets(
     modified_offset_cards: dict[CardId, Card] = {}
 
     auto_suspend_tag = am_config.tag_suspended_automatically
-
-    def _sanitize_tags(note: Note) -> None:
-        cleaned = [tag for tag in note.tags if tag and tag.strip()]
-        if len(cleaned) != len(note.tags):
-            note.tags = cleaned
+    suspended = tags_and_queue_utils.suspended
 
     def _ensure_note(card: Card) -> Note:
         note = modified_notes.get(card.nid)
@@ -648,9 +667,31 @@ def _apply_offsets(
         if note is None:
             note = mw.col.get_note(card.nid)
             notes_cache[card.nid] = note
-        note_original_state.setdefault(note.id, (list(note.fields), list(note.tags)))
+        # setdefault would copy the fields and tags even when already stored
+        if note.id not in note_original_state:
+            note_original_state[note.id] = (note.fields.copy(), note.tags.copy())
         return note
 
+    stored_note_tags: dict[int, list[str]] = {}
+
+    def _note_has_tag(card: Card, tag: str) -> bool:
+        # Only the tags are needed here, so we avoid materializing the full
+        # note unless it has already been loaded.
+        note = modified_notes.get(card.nid)
+        if note is None:
+            note = notes_cache.get(card.nid)
+        if note is not None:
+            return tag in note.tags
+
+        tags = stored_note_tags.get(card.nid)
+        if tags is None:
+            tags_string = mw.col.db.scalar(
+                "SELECT tags FROM notes WHERE id = ?", card.nid
+            )
+            tags = tags_string.split() if isinstance(tags_string, str) else []
+            stored_note_tags[card.nid] = tags
+        return tag in tags
+
     original_positions_cache: dict[int, dict[str, int]] = {}
 
     def _insert_tag_preserving_order(note: Note, tag: str) -> None:
@@ -668,16 +709,16 @@ def _apply_offsets(
 
     for unknown_morph, earliest_due_card in earliest_due_card_for_unknown_morph.items():
         base_card = already_modified_cards.get(earliest_due_card.id, earliest_due_card)
-        base_note = _ensure_note(base_card)
 
         tag_removed = False
-        if auto_suspend_tag in base_note.tags and base_card.due != _MAX_SCORE:
+        if base_card.due != _MAX_SCORE and _note_has_tag(base_card, auto_suspend_tag):
+            base_note = _ensure_note(base_card)
             base_note.tags.remove(auto_suspend_tag)
-            _sanitize_tags(base_note)
+            tags_and_queue_utils._sanitize_tags(base_note)
             modified_notes[base_note.id] = base_note
             tag_removed = True
 
-        if tag_removed and base_card.queue == tags_and_queue_utils.suspended:
+        if tag_removed and base_card.queue == suspended:
             base_card.queue = CardQueue(0)
             modified_offset_cards[base_card.id] = base_card
 
@@ -695,13 +736,13 @@ def _apply_offsets(
             note = _ensure_note(existing_card)
             if auto_suspend_tag not in note.tags:
                 _insert_tag_preserving_order(note, auto_suspend_tag)
-                _sanitize_tags(note)
+                tags_and_queue_utils._sanitize_tags(note)
                 modified_notes[note.id] = note
 
             card_modified = False
 
-            if existing_card.queue != tags_and_queue_utils.suspended:
-                existing_card.queue = tags_and_queue_utils.suspended
+            if existing_card.queue != suspended:
+                existing_card.queue = suspended
                 card_modified = True
 
             if existing_card.due != _MAX_SCORE:
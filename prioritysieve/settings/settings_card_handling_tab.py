@@ -8,6 +8,7 @@ from aqt.qt import (  # pylint:disable=no-name-in-module
     QListWidget,
     QPushButton,
     QSpinBox,
+    QTimer,
 )
 
 from .. import prioritysieve_globals as ps_globals
@@ -16,7 +17,13 @@ from ..ui.settings_dialog_ui import Ui_SettingsDialog
 from .settings_tab import SettingsTab
 
 
+_MAX_SQL_VARIABLES = 900
+
+
 class CardHandlingTab(SettingsTab):
+    # note type amount -> deck ids query
+    _deck_ids_queries: dict[int, str] = {}
+
     def __init__(
         self,
         parent: QDialog,
@@ -36,9 +43,24 @@ class CardHandlingTab(SettingsTab):
         self._raw_config_key_to_spin_box: dict[str, QSpinBox | QDoubleSpinBox] = {}
 
         self._priority_deck_list_widget: QListWidget = self.ui.priorityDecksListWidget
+        # mirrors the order of the list widget items so we don't have to read
+        # every item back from Qt when saving
+        self._priority_deck_order: list[str] = []
+        # set while the list is being rebuilt so the row change signals don't
+        # recompute the button states before the final update
+        self._priority_deck_controls_update_suspended = False
+        self._priority_deck_controls_update_pending = False
         self._priority_deck_move_up_button: QPushButton = self.ui.priorityDeckMoveUpButton
         self._priority_deck_move_down_button: QPushButton = self.ui.priorityDeckMoveDownButton
         self._priority_deck_refresh_button: QPushButton = self.ui.priorityDeckRefreshButton
+
+        # (note type names, collection mod time, deck names)
+        self._available_decks_cache: tuple[frozenset[str], int, list[str]] | None = None
+
+        # Building the deck list queries the collection, which can be slow on
+        # large collections, so it is deferred until the tab is first shown.
+        self._priority_decks_populated = False
+        self._priority_decks_source: PrioritySieveConfig = self._config
 
         self.populate()
         self.setup_buttons()
@@ -47,12 +69,36 @@ class CardHandlingTab(SettingsTab):
     def populate(self, use_default_config: bool = False) -> None:
         super().populate(use_default_config)
 
-        source = self._default_config if use_default_config else self._config
+        self._priority_decks_source = (
+            self._default_config if use_default_config else self._config
+        )
+
+        if self._priority_decks_populated or use_default_config:
+            self._populate_priority_decks()
 
+    def _populate_priority_decks(self) -> None:
+        source = self._priority_decks_source
         deck_order = self._build_priority_deck_list(
             source, source.recalc_offset_priority_decks
         )
         self._set_priority_deck_items(deck_order)
+        self._priority_decks_populated = True
+
+    def _on_tab_changed(self, _index: int) -> None:
+        if self._priority_decks_populated:
+            return
+
+        if self.ui.tabWidget.currentWidget() is not self.ui.card_handling_tab:
+            return
+
+        self._populate_priority_decks()
+
+        # the populated list is derived from the config, so it should not be
+        # treated as an unsaved change
+        if self._previous_state is not None:
+            self._previous_state[RawConfigKeys.RECALC_OFFSET_PRIORITY_DECKS] = (
+                self._get_priority_decks_from_ui()
+            )
 
     def setup_buttons(self) -> None:
         self.ui.restoreCardHandlingPushButton.setAutoDefault(False)
@@ -70,18 +116,42 @@ class CardHandlingTab(SettingsTab):
         self._priority_deck_list_widget.currentRowChanged.connect(
             self._on_priority_deck_selection_changed
         )
+        self.ui.tabWidget.currentChanged.connect(self._on_tab_changed)
 
     def settings_to_dict(self) -> dict[str, str | int | float | bool | object]:
         settings = super().settings_to_dict()
-        settings[RawConfigKeys.RECALC_OFFSET_PRIORITY_DECKS] = (
-            self._get_priority_decks_from_ui()
-        )
+
+        if self._priority_decks_populated:
+            priority_decks = self._get_priority_decks_from_ui()
+        else:
+            priority_decks = list(
+                self._priority_decks_source.recalc_offset_priority_decks
+            )
+
+        settings[RawConfigKeys.RECALC_OFFSET_PRIORITY_DECKS] = priority_decks
         return settings
 
     def _on_priority_deck_selection_changed(self, _row: int) -> None:
+        # rebuilds and moves update the controls themselves once they're done
+        if self._priority_deck_controls_update_suspended:
+            return
+
+        # Rapid row changes (e.g. holding an arrow key) are coalesced into a
+        # single update per event loop iteration.
+        if self._priority_deck_controls_update_pending:
+            return
+
+        self._priority_deck_controls_update_pending = True
+        QTimer.singleShot(0, self._flush_priority_deck_controls_update)
+
+    def _flush_priority_deck_controls_update(self) -> None:
+        self._priority_deck_controls_update_pending = False
         self._update_priority_deck_controls()
 
     def _update_priority_deck_controls(self, enabled: bool | None = None) -> None:
+        if self._priority_deck_controls_update_suspended:
+            return
+
         if enabled is None:
             enabled = True
 
@@ -111,15 +181,36 @@ class CardHandlingTab(SettingsTab):
         if new_row < 0 or new_row >= self._priority_deck_list_widget.count():
             return
 
-        item = self._priority_deck_list_widget.takeItem(current_row)
-        if item is None:
+        current_item = self._priority_deck_list_widget.item(current_row)
+        new_item = self._priority_deck_list_widget.item(new_row)
+        if current_item is None or new_item is None:
             return
 
-        self._priority_deck_list_widget.insertItem(new_row, item)
-        self._priority_deck_list_widget.setCurrentRow(new_row)
+        # The items only hold the deck names, so swapping their texts avoids
+        # the structural remove/insert model events of takeItem/insertItem.
+        current_text = current_item.text()
+        self._priority_deck_list_widget.blockSignals(True)
+        try:
+            current_item.setText(new_item.text())
+            new_item.setText(current_text)
+        finally:
+            self._priority_deck_list_widget.blockSignals(False)
+
+        self._priority_deck_order[current_row], self._priority_deck_order[new_row] = (
+            self._priority_deck_order[new_row],
+            self._priority_deck_order[current_row],
+        )
+        self._priority_deck_controls_update_suspended = True
+        try:
+            self._priority_deck_list_widget.setCurrentRow(new_row)
+        finally:
+            self._priority_deck_controls_update_suspended = False
         self._update_priority_deck_controls()
 
     def _refresh_priority_decks(self) -> None:
+        # the user explicitly asked for a refresh, so we don't trust the cache
+        self._available_decks_cache = None
+
         preferred_order = self._get_priority_decks_from_ui()
         deck_order = self._build_priority_deck_list(self._config, preferred_order)
         self._set_priority_deck_items(deck_order)
@@ -133,11 +224,13 @@ class CardHandlingTab(SettingsTab):
         if preferred_order is None:
             preferred_order = source_config.recalc_offset_priority_decks
 
+        # the list is kept for the stable ordering of the remaining decks
+        available_decks_set = set(available_decks)
         ordered: list[str] = []
         seen: set[str] = set()
 
         for deck_name in preferred_order:
-            if deck_name in available_decks and deck_name not in seen:
+            if deck_name in available_decks_set and deck_name not in seen:
                 ordered.append(deck_name)
                 seen.add(deck_name)
 
@@ -152,31 +245,57 @@ class CardHandlingTab(SettingsTab):
         current_item = self._priority_deck_list_widget.currentItem()
         current_text = current_item.text() if current_item is not None else None
 
-        self._priority_deck_list_widget.clear()
-        for deck_name in deck_names:
-            self._priority_deck_list_widget.addItem(deck_name)
-
-        if deck_names:
-            if current_text in deck_names:
-                target_row = deck_names.index(current_text)
+        if deck_names != self._priority_deck_order:
+            self._replace_priority_deck_items(deck_names)
+
+        self._priority_deck_controls_update_suspended = True
+        try:
+            if deck_names:
+                if current_text in deck_names:
+                    target_row = deck_names.index(current_text)
+                else:
+                    target_row = 0
+                self._priority_deck_list_widget.setCurrentRow(target_row)
             else:
-                target_row = 0
-            self._priority_deck_list_widget.setCurrentRow(target_row)
-        else:
-            self._priority_deck_list_widget.setCurrentRow(-1)
+                self._priority_deck_list_widget.setCurrentRow(-1)
+        finally:
+            self._priority_deck_controls_update_suspended = False
 
         self._update_priority_deck_controls()
 
+    def _replace_priority_deck_items(self, deck_names: list[str]) -> None:
+        # Refreshes usually keep most of the order intact, so only the items
+        # after the common prefix are replaced.
+        common_prefix_length = 0
+        for old_name, new_name in zip(self._priority_deck_order, deck_names):
+            if old_name != new_name:
+                break
+            common_prefix_length += 1
+
+        # insert all the items in one go without repainting or emitting
+        # signals for every single row
+        self._priority_deck_list_widget.setUpdatesEnabled(False)
+        self._priority_deck_list_widget.blockSignals(True)
+        try:
+            if common_prefix_length == 0:
+                self._priority_deck_list_widget.clear()
+            else:
+                for row in range(
+                    self._priority_deck_list_widget.count() - 1,
+                    common_prefix_length - 1,
+                    -1,
+                ):
+                    self._priority_deck_list_widget.takeItem(row)
+            self._priority_deck_list_widget.addItems(
+                deck_names[common_prefix_length:]
+            )
+            self._priority_deck_order = list(deck_names)
+        finally:
+            self._priority_deck_list_widget.blockSignals(False)
+            self._priority_deck_list_widget.setUpdatesEnabled(True)
+
     def _get_priority_decks_from_ui(self) -> list[str]:
-        decks: list[str] = []
-        for index in range(self._priority_deck_list_widget.count()):
-            item = self._priority_deck_list_widget.item(index)
-            if item is None:
-                continue
-            deck_name = item.text().strip()
-            if deck_name:
-                decks.append(deck_name)
-        return decks
+        return list(self._priority_deck_order)
 
     def _get_available_decks_for_note_types(
         self, config: PrioritySieveConfig
@@ -184,47 +303,82 @@ class CardHandlingTab(SettingsTab):
         if mw is None or mw.col is None or mw.col.db is None:
             return []
 
-        note_type_names = {
+        note_type_names = frozenset(
             config_filter.note_type
             for config_filter in config.filters
             if config_filter.note_type != ps_globals.NONE_OPTION
-        }
+        )
 
         if not note_type_names:
             return []
 
-        note_type_ids: list[int] = []
-        for note_type_name in note_type_names:
-            note_type_id = mw.col.models.id_for_name(note_type_name)
-            if note_type_id is not None:
-                note_type_ids.append(note_type_id)
+        # renaming or deleting note types also bumps the collection mod time,
+        # so the names are enough to identify the query
+        collection_mod = mw.col.mod
+        if self._available_decks_cache is not None:
+            cached_names, cached_mod, cached_decks = self._available_decks_cache
+            if cached_names == note_type_names and cached_mod == collection_mod:
+                return cached_decks
+
+        note_type_ids_by_name: dict[str, int] = {
+            note_type.name: note_type.id
+            for note_type in mw.col.models.all_names_and_ids()
+        }
+        note_type_ids: list[int] = [
+            note_type_ids_by_name[note_type_name]
+            for note_type_name in note_type_names
+            if note_type_name in note_type_ids_by_name
+        ]
 
         if not note_type_ids:
             return []
 
-        placeholders = ",".join("?" for _ in note_type_ids)
-        query = f"""
-            SELECT DISTINCT c.did
-            FROM cards c
-            JOIN notes n ON c.nid = n.id
-            WHERE n.mid IN ({placeholders})
-        """
-
-        deck_ids = mw.col.db.list(query, *note_type_ids)
-        if deck_ids is None:
+        # sqlite limits the amount of bound variables, so large amounts of
+        # note types are queried in chunks
+        deck_ids: set[int] = set()
+        for start in range(0, len(note_type_ids), _MAX_SQL_VARIABLES):
+            note_type_ids_chunk = note_type_ids[start : start + _MAX_SQL_VARIABLES]
+            deck_ids.update(
+                mw.col.db.list(
+                    self._get_deck_ids_query(len(note_type_ids_chunk)),
+                    *note_type_ids_chunk,
+                )
+            )
+
+        if not deck_ids:
             return []
 
-        deck_names: set[str] = set()
-        for deck_id in deck_ids:
-            deck_dict = mw.col.decks.get(deck_id)
-            if deck_dict is None:
-                continue
-
-            deck_name = deck_dict.get("name")
-            if isinstance(deck_name, str):
-                deck_names.add(deck_name)
-
-        return sorted(deck_names)
+        # The names in the decks table use a different separator than the
+        # deck manager, so we resolve all the names in a single call instead
+        # of fetching every deck dict individually. Deck names are unique, so
+        # the filtered names can be sorted directly.
+        available_decks = sorted(
+            deck.name
+            for deck in mw.col.decks.all_names_and_ids()
+            if deck.id in deck_ids
+        )
+        self._available_decks_cache = (
+            note_type_names,
+            collection_mod,
+            available_decks,
+        )
+        return available_decks
+
+    @classmethod
+    def _get_deck_ids_query(cls, note_type_amount: int) -> str:
+        # Reusing the exact same query string lets the statement cache of the
+        # collection db skip re-parsing it.
+        query = cls._deck_ids_queries.get(note_type_amount)
+        if query is None:
+            placeholders = ",".join("?" * note_type_amount)
+            query = f"""
+                SELECT DISTINCT c.did
+                FROM cards c
+                JOIN notes n ON c.nid = n.id
+                WHERE n.mid IN ({placeholders})
+            """
+            cls._deck_ids_queries[note_type_amount] = query
+        return query
 
     def get_confirmation_text(self) -> str:
         return "Are you sure you want to restore default skip settings?"
@@ -20,6 +20,9 @@ from .data_provider import DataProvider
 from .data_subscriber import DataSubscriber
 from .settings_tab import SettingsTab
 
+_CHECKED = Qt.CheckState.Checked
+_UNCHECKED = Qt.CheckState.Unchecked
+
 
 class ExtraFieldsTab(SettingsTab, DataSubscriber, DataExtractor):
     """Allow selecting which note types receive the generated reading field."""
@@ -36,9 +39,12 @@ class ExtraFieldsTab(SettingsTab, DataSubscriber, DataExtractor):
         SettingsTab.__init__(self, parent, ui, config, default_config)
         DataExtractor.__init__(self)
 
-        self._selected_note_types: list[str] = [
-            _filter.note_type for _filter in self._config.filters
-        ]
+        self._selected_note_types: list[str] = self._get_displayed_note_types(
+            [_filter.note_type for _filter in self._config.filters]
+        )
+
+        # used to look up the node of a note type without scanning the tree
+        self._top_nodes_by_name: dict[str, QTreeWidgetItem] = {}
 
         self.ui.groupBox_5.hide()
 
@@ -54,84 +60,103 @@ class ExtraFieldsTab(SettingsTab, DataSubscriber, DataExtractor):
         self.update_previous_state()
 
     def update(self, selected_note_types: list[str]) -> None:
-        self._selected_note_types = selected_note_types
+        self._selected_note_types = self._get_displayed_note_types(selected_note_types)
         self._populate_tree()
 
+    @staticmethod
+    def _get_displayed_note_types(note_types: list[str]) -> list[str]:
+        # filtered once here so the tree can be rebuilt without re-checking
+        # every entry, a dict keeps the order while dropping duplicates
+        return list(
+            dict.fromkeys(
+                note_type
+                for note_type in note_types
+                if note_type != ps_globals.NONE_OPTION
+            )
+        )
+
     def populate(self, use_default_config: bool = False) -> None:
         super().populate(use_default_config)
         self._populate_tree(restore_defaults=use_default_config)
 
     def _populate_tree(self, restore_defaults: bool = False) -> None:
         self.ui.extraFieldsTreeWidget.clear()
+        self._top_nodes_by_name = {}
+        sorting_enabled = self.ui.extraFieldsTreeWidget.isSortingEnabled()
+        self.ui.extraFieldsTreeWidget.setSortingEnabled(False)
+        self.ui.extraFieldsTreeWidget.setUpdatesEnabled(False)
         self.ui.extraFieldsTreeWidget.blockSignals(True)
 
+        filters = (
+            self._default_config.filters if restore_defaults else self._config.filters
+        )
+
+        # the first filter of a note type decides whether it is selected
+        selected_in_config: dict[str, bool] = {}
+        for _filter in filters:
+            selected_in_config.setdefault(
+                _filter.note_type, getattr(_filter, "extra_reading_field", False)
+            )
+
+        top_nodes: list[QTreeWidgetItem] = []
         for note_type in self._selected_note_types:
-            if note_type == ps_globals.NONE_OPTION:
-                continue
+            top_node = self._create_top_node(
+                note_type, selected_in_config.get(note_type, False)
+            )
+            top_nodes.append(top_node)
+            self._top_nodes_by_name[note_type] = top_node
 
-            top_node = self._create_top_node(note_type, restore_defaults)
-            self.ui.extraFieldsTreeWidget.addTopLevelItem(top_node)
+        self.ui.extraFieldsTreeWidget.addTopLevelItems(top_nodes)
 
         self.ui.extraFieldsTreeWidget.blockSignals(False)
+        self.ui.extraFieldsTreeWidget.setUpdatesEnabled(True)
+        self.ui.extraFieldsTreeWidget.setSortingEnabled(sorting_enabled)
 
-    def _create_top_node(
-        self, note_type: str, restore_defaults: bool = False
-    ) -> QTreeWidgetItem:
-        selected_in_config = self.get_selected_extra_fields_from_config(
-            note_type, restore_defaults
-        )
-
+    def _create_top_node(self, note_type: str, is_selected: bool) -> QTreeWidgetItem:
         top_node = QTreeWidgetItem()
         top_node.setText(0, note_type)
-        top_node.setCheckState(0, Qt.CheckState.Unchecked)
+        top_node.setCheckState(0, _UNCHECKED)
 
-        child_item = QTreeWidgetItem(top_node)
+        # the nodes are built detached from the tree and attached all at once
+        child_item = QTreeWidgetItem()
         child_item.setText(0, self._EXTRA_FIELD_NAME)
 
-        if selected_in_config[self._EXTRA_FIELD_NAME]:
-            top_node.setCheckState(0, Qt.CheckState.Checked)
-            child_item.setCheckState(0, Qt.CheckState.Checked)
+        if is_selected:
+            top_node.setCheckState(0, _CHECKED)
+            child_item.setCheckState(0, _CHECKED)
         else:
-            child_item.setCheckState(0, Qt.CheckState.Unchecked)
+            child_item.setCheckState(0, _UNCHECKED)
             child_item.setDisabled(True)
 
+        top_node.addChild(child_item)
         return top_node
 
-    def get_selected_extra_fields_from_config(
-        self, note_type: str, restore_defaults: bool = False
-    ) -> dict[str, bool]:
-        is_selected = False
-        filters = (
-            self._default_config.filters if restore_defaults else self._config.filters
-        )
-
-        for _filter in filters:
-            if _filter.note_type == note_type:
-                is_selected = getattr(
-                    _filter, "extra_reading_field", False
-                )
-                break
+    def _tree_item_changed(self, item: QTreeWidgetItem, column: int) -> None:
+        if item.parent() is not None:
+            return
 
-        return {self._EXTRA_FIELD_NAME: is_selected}
+        # top-level toggled
+        child = item.child(0)
+        if child is None:
+            return
 
-    def _tree_item_changed(self, item: QTreeWidgetItem, column: int) -> None:
-        self.ui.extraFieldsTreeWidget.blockSignals(True)
+        is_checked = item.checkState(column) == _CHECKED
+        target_state = _CHECKED if is_checked else _UNCHECKED
 
-        parent = item.parent()
-        if parent is None:
-            # top-level toggled
-            if item.checkState(column) == Qt.CheckState.Checked:
-                child = item.child(0)
-                if child is not None:
-                    child.setDisabled(False)
-                    child.setCheckState(0, Qt.CheckState.Checked)
-            else:
-                child = item.child(0)
-                if child is not None:
-                    child.setCheckState(0, Qt.CheckState.Unchecked)
-                    child.setDisabled(True)
+        # only touch the child when it is out of sync to avoid needless repaints
+        if child.checkState(0) == target_state and child.isDisabled() != is_checked:
+            return
 
-        self.ui.extraFieldsTreeWidget.blockSignals(False)
+        self.ui.extraFieldsTreeWidget.setUpdatesEnabled(False)
+        self.ui.extraFieldsTreeWidget.blockSignals(True)
+        try:
+            if child.isDisabled() == is_checked:
+                child.setDisabled(not is_checked)
+            if child.checkState(0) != target_state:
+                child.setCheckState(0, target_state)
+        finally:
+            self.ui.extraFieldsTreeWidget.blockSignals(False)
+            self.ui.extraFieldsTreeWidget.setUpdatesEnabled(True)
 
     def setup_buttons(self) -> None:
         self.ui.restoreExtraFieldsPushButton.setAutoDefault(False)
@@ -150,14 +175,12 @@ class ExtraFieldsTab(SettingsTab, DataSubscriber, DataExtractor):
         self._populate_tree(restore_defaults=True)
 
     def get_selected_extra_fields(self, note_type_name: str) -> dict[str, bool]:
-        for top_index in range(self.ui.extraFieldsTreeWidget.topLevelItemCount()):
-            top_node = self.ui.extraFieldsTreeWidget.topLevelItem(top_index)
-            if top_node is not None and top_node.text(0) == note_type_name:
-                child = top_node.child(0)
-                if child is not None:
-                    is_checked = child.checkState(0) == Qt.CheckState.Checked
-                    return {RawConfigFilterKeys.EXTRA_READING_FIELD: is_checked}
-                break
+        top_node = self._top_nodes_by_name.get(note_type_name)
+        if top_node is not None:
+            child = top_node.child(0)
+            if child is not None:
+                is_checked = child.checkState(0) == _CHECKED
+                return {RawConfigFilterKeys.EXTRA_READING_FIELD: is_checked}
         return {RawConfigFilterKeys.EXTRA_READING_FIELD: False}
 
     def get_confirmation_text(self) -> str:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from aqt.qt import QCheckBox, QDialog, QLineEdit, Qt  # pylint:disable=no-name-in-module
+from aqt.qt import QCheckBox, QDialog, QLineEdit  # pylint:disable=no-name-in-module
 
 from ..prioritysieve_config import PrioritySieveConfig, RawConfigKeys
 from ..ui.settings_dialog_ui import Ui_SettingsDialog
@@ -30,6 +30,9 @@ class PreprocessTab(SettingsTab):
 
         self.ui.preprocessIgnoreNamesMizerCheckBox.hide()
 
+        # the last applied state, so repeated toggles don't touch the widget
+        self._custom_characters_line_edit_enabled: bool | None = None
+
         self._raw_config_key_to_line_edit: dict[str, QLineEdit] = {
             RawConfigKeys.PREPROCESS_CUSTOM_CHARACTERS_TO_IGNORE: self.ui.preprocessCustomCharactersLineEdit,
         }
@@ -51,13 +54,12 @@ class PreprocessTab(SettingsTab):
         )
 
     def _toggle_disable_custom_characters_line_edit(self) -> None:
-        if (
-            self.ui.preprocessIgnoreCustomCharactersCheckBox.checkState()
-            == Qt.CheckState.Unchecked
-        ):
-            self.ui.preprocessCustomCharactersLineEdit.setDisabled(True)
-        else:
-            self.ui.preprocessCustomCharactersLineEdit.setEnabled(True)
+        enabled = self.ui.preprocessIgnoreCustomCharactersCheckBox.isChecked()
+        if enabled == self._custom_characters_line_edit_enabled:
+            return
+
+        self.ui.preprocessCustomCharactersLineEdit.setEnabled(enabled)
+        self._custom_characters_line_edit_enabled = enabled
 
     def get_confirmation_text(self) -> str:
         return "Are you sure you want to restore default preprocess settings?"
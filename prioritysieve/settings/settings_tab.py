@@ -130,40 +130,27 @@ class SettingsTab(ABC):  # pylint:disable=too-many-instance-attributes
         self.populate()
 
     def settings_to_dict(self) -> dict[str, str | int | float | bool | object]:
-        radio_button_settings = {
-            config_key: radio_button.isChecked()
-            for config_key, radio_button in self._raw_config_key_to_radio_button.items()
-        }
-        spin_box_settings = {
-            config_key: spin_box.value()
-            for config_key, spin_box in self._raw_config_key_to_spin_box.items()
-        }
-        combo_box_settings = {
-            config_key: combo_box.currentText()
-            for config_key, combo_box in self._raw_config_key_to_combo_box.items()
-        }
-
-        check_box_settings = {
-            config_key: checkbox.isChecked()
-            for config_key, checkbox in self._raw_config_key_to_check_box.items()
-        }
-
-        line_edit_settings = {
-            config_key: line_edit.text()
-            for config_key, line_edit in self._raw_config_key_to_line_edit.items()
-        }
-        key_sequence_settings = {
-            config_key: key_sequence.keySequence().toString()
-            for config_key, key_sequence in self._raw_config_key_to_key_sequence.items()
-        }
-
+        # the widget values are written straight into the result instead of
+        # building and merging an intermediate dict per widget type
         settings_dict: dict[str, str | int | bool | object] = {}
-        settings_dict.update(radio_button_settings)
-        settings_dict.update(spin_box_settings)
-        settings_dict.update(combo_box_settings)
-        settings_dict.update(check_box_settings)
-        settings_dict.update(line_edit_settings)
-        settings_dict.update(key_sequence_settings)
+
+        for config_key, radio_button in self._raw_config_key_to_radio_button.items():
+            settings_dict[config_key] = radio_button.isChecked()
+
+        for config_key, spin_box in self._raw_config_key_to_spin_box.items():
+            settings_dict[config_key] = spin_box.value()
+
+        for config_key, combo_box in self._raw_config_key_to_combo_box.items():
+            settings_dict[config_key] = combo_box.currentText()
+
+        for config_key, checkbox in self._raw_config_key_to_check_box.items():
+            settings_dict[config_key] = checkbox.isChecked()
+
+        for config_key, line_edit in self._raw_config_key_to_line_edit.items():
+            settings_dict[config_key] = line_edit.text()
+
+        for config_key, key_sequence in self._raw_config_key_to_key_sequence.items():
+            settings_dict[config_key] = key_sequence.keySequence().toString()
 
         return settings_dict
 
@@ -18,11 +18,24 @@ from aqt.utils import tooltip
 
 from . import prioritysieve_globals as am_globals
 from . import message_box_utils
+from .exceptions import CancelledOperationException
 from .extra_settings import extra_settings_keys
 from .extra_settings.prioritysieve_extra_settings import PrioritySieveExtraSettings
 from .morphemizers import sudachi_wrapper
 from .ui.sudachi_manager_dialog_ui import Ui_SudachiManagerDialog
 
+_VARIANT_LABELS: dict[str, str] = {
+    "small": "small (minimal)",
+    "core": "core (recommended)",
+    "full": "full (largest)",
+}
+
+# (variant, label) pairs in the order they are listed in the dialog
+_VARIANT_ITEMS: tuple[tuple[str, str], ...] = tuple(
+    (variant, _VARIANT_LABELS.get(variant, variant))
+    for variant in sudachi_wrapper.SUDACHI_DICTIONARY_VARIANTS
+)
+
 
 class SudachiManagerDialog(QDialog):
     def __init__(self) -> None:
@@ -32,11 +45,9 @@ class SudachiManagerDialog(QDialog):
         self.ui = Ui_SudachiManagerDialog()  # pylint:disable=invalid-name
         self.ui.setupUi(self)  # type: ignore[no-untyped-call]
 
-        self._variant_labels: dict[str, str] = {
-            "small": "small (minimal)",
-            "core": "core (recommended)",
-            "full": "full (largest)",
-        }
+        # Listing the installed variants reads the packages directory, so it
+        # is only done on refresh and not on every selection change.
+        self._installed_variants: set[str] = set()
 
         self._setup_icons()
         self._setup_buttons()
@@ -83,8 +94,7 @@ class SudachiManagerDialog(QDialog):
     def _setup_lists(self) -> None:
         self.ui.dictionariesListWidget.clear()
 
-        for variant in sudachi_wrapper.SUDACHI_DICTIONARY_VARIANTS:
-            label = self._variant_labels.get(variant, variant)
+        for variant, label in _VARIANT_ITEMS:
             item = QListWidgetItem(label)
             item.setData(Qt.ItemDataRole.UserRole, variant)
             self.ui.dictionariesListWidget.addItem(item)
@@ -94,6 +104,9 @@ class SudachiManagerDialog(QDialog):
         )
 
     def _refresh(self) -> None:
+        self._installed_variants = set(
+            sudachi_wrapper.list_installed_dictionary_variants()
+        )
         self._update_status_label()
         self._populate_dictionary_icons()
         self._toggle_dictionary_action_buttons(
@@ -101,7 +114,8 @@ class SudachiManagerDialog(QDialog):
         )
 
     def _update_status_label(self) -> None:
-        if sudachi_wrapper.is_sudachipy_installed():
+        # installed dictionaries imply that SudachiPy is installed as well
+        if self._installed_variants or sudachi_wrapper.is_sudachipy_installed():
             text = "SudachiPy is installed"
             self.ui.installSudachiButton.setDisabled(True)
             self.ui.removeSudachiButton.setEnabled(True)
@@ -112,12 +126,10 @@ class SudachiManagerDialog(QDialog):
         self.ui.sudachiStatusLabel.setText(text)
 
     def _populate_dictionary_icons(self) -> None:
-        installed_variants = set(sudachi_wrapper.list_installed_dictionary_variants())
-
         for index in range(self.ui.dictionariesListWidget.count()):
             item = self.ui.dictionariesListWidget.item(index)
             variant = item.data(Qt.ItemDataRole.UserRole)
-            if variant in installed_variants:
+            if variant in self._installed_variants:
                 item.setIcon(self.apply_icon)
             else:
                 item.setIcon(self.transparent_icon)
@@ -133,9 +145,8 @@ class SudachiManagerDialog(QDialog):
             return
 
         variant = current_item.data(Qt.ItemDataRole.UserRole)
-        installed_variants = set(sudachi_wrapper.list_installed_dictionary_variants())
 
-        if variant in installed_variants:
+        if variant in self._installed_variants:
             self.ui.installDictionaryButton.setDisabled(True)
             self.ui.removeDictionaryButton.setEnabled(True)
         else:
@@ -158,7 +169,9 @@ class SudachiManagerDialog(QDialog):
 
         operation = QueryOp(
             parent=self,
-            op=lambda _: sudachi_wrapper.install_sudachipy(),
+            op=lambda _: sudachi_wrapper.install_sudachipy(
+                should_cancel=mw.progress.want_cancel
+            ),
             success=lambda _: _on_success(),
         )
         operation.failure(self._on_failure)
@@ -206,7 +219,9 @@ class SudachiManagerDialog(QDialog):
         mw.progress.start(label=f"Installing {label}")
         operation = QueryOp(
             parent=self,
-            op=lambda _: sudachi_wrapper.install_dictionary(variant),
+            op=lambda _: sudachi_wrapper.install_dictionary(
+                variant, should_cancel=mw.progress.want_cancel
+            ),
             success=lambda _: _on_success(),
         )
         operation.failure(self._on_failure)
@@ -247,13 +262,16 @@ class SudachiManagerDialog(QDialog):
         if stored_geometry is not None:
             self.restoreGeometry(stored_geometry)
 
-    def _on_failure(self, failure: Exception) -> None:
+    def _on_failure(self, failure: Exception | CancelledOperationException) -> None:
         mw.progress.finish()
-        message_box_utils.show_error_box(
-            title="Error",
-            body=f"{failure}",
-            parent=self,
-        )
+        if isinstance(failure, CancelledOperationException):
+            tooltip("Cancelled install", parent=self)
+        else:
+            message_box_utils.show_error_box(
+                title="Error",
+                body=f"{failure}",
+                parent=self,
+            )
         self._refresh()
 
     def closeWithCallback(  # pylint:disable=invalid-name
@@ -38,84 +38,89 @@ def update_tags_and_queue_of_new_card(
     #
     # Note: only new cards are handled in this function!
 
+    # this runs for every new card, so the config attributes are read once
+    tag_ready = am_config.tag_ready
+    tag_not_ready = am_config.tag_not_ready
+    tag_known_automatically = am_config.tag_known_automatically
+    tag_known_manually = am_config.tag_known_manually
+    tag_fresh = am_config.tag_fresh
+    auto_suspended_tag = am_config.tag_suspended_automatically
+
     mutually_exclusive_tags: list[str] = [
-        am_config.tag_ready,
-        am_config.tag_not_ready,
-        am_config.tag_known_automatically,
+        tag_ready,
+        tag_not_ready,
+        tag_known_automatically,
     ]
 
-    tracked_tags = set(mutually_exclusive_tags)
-    tracked_tags.add(am_config.tag_suspended_automatically)
-    original_positions: dict[str, int] = {}
-    for index, tag in enumerate(note.tags):
-        if tag in tracked_tags and tag not in original_positions:
-            original_positions[tag] = index
+    # The membership checks and removals are done against a set, and the
+    # note tags are only rebuilt once at the end. Tags that were already on
+    # the note keep their original positions, new ones are appended.
+    original_tags: list[str] = note.tags
+    original_tags_set: set[str] = set(original_tags)
+    tags: set[str] = set(original_tags_set)
+    added_tags: list[str] = []
 
-    def _insert_tag(tag: str) -> None:
-        position = original_positions.get(tag)
-        if position is None or position >= len(note.tags):
-            note.tags.append(tag)
-        else:
-            note.tags.insert(position, tag)
+    def _add_tag(tag: str) -> None:
+        tags.add(tag)
+        if tag not in original_tags_set and tag not in added_tags:
+            added_tags.append(tag)
 
     has_learning_for_tag = has_learning_morphs and unknowns > 0
 
     if has_learning_for_tag:
-        if am_config.tag_fresh not in note.tags:
-            note.tags.append(am_config.tag_fresh)
+        _add_tag(tag_fresh)
     else:
-        if am_config.tag_fresh in note.tags:
-            note.tags.remove(am_config.tag_fresh)
-
-    auto_suspended_tag = am_config.tag_suspended_automatically
+        tags.discard(tag_fresh)
 
     should_auto_suspend = force_auto_suspend or unknowns == 0
 
     if should_auto_suspend:
-        if auto_suspended_tag not in note.tags:
-            _insert_tag(auto_suspended_tag)
+        _add_tag(auto_suspended_tag)
         if card.queue != suspended:
             card.queue = suspended
         if card.due != _MAX_SCORE:
             card.due = _MAX_SCORE
-    elif auto_suspended_tag in note.tags:
-        note.tags.remove(auto_suspended_tag)
+    elif auto_suspended_tag in tags:
+        tags.discard(auto_suspended_tag)
         if card.queue == suspended:
             card.queue = CardQueue(0)
 
     if unknowns == 0:
-        if am_config.tag_known_manually in note.tags:
-            _remove_exclusive_tags(note, mutually_exclusive_tags)
-        elif am_config.tag_known_automatically not in note.tags:
-            _remove_exclusive_tags(note, mutually_exclusive_tags)
-            _insert_tag(am_config.tag_known_automatically)
+        if tag_known_manually in tags:
+            tags.difference_update(mutually_exclusive_tags)
+        elif tag_known_automatically not in tags:
+            tags.difference_update(mutually_exclusive_tags)
+            _add_tag(tag_known_automatically)
     elif unknowns == 1:
         if should_auto_suspend:
-            _remove_exclusive_tags(note, mutually_exclusive_tags)
-            if am_config.tag_not_ready not in note.tags:
-                _insert_tag(am_config.tag_not_ready)
+            tags.difference_update(mutually_exclusive_tags)
+            _add_tag(tag_not_ready)
         else:
-            if am_config.tag_ready not in note.tags:
-                _remove_exclusive_tags(note, mutually_exclusive_tags)
-                _insert_tag(am_config.tag_ready)
+            if tag_ready not in tags:
+                tags.difference_update(mutually_exclusive_tags)
+                _add_tag(tag_ready)
     else:
-        if am_config.tag_not_ready not in note.tags:
-            _remove_exclusive_tags(note, mutually_exclusive_tags)
-            _insert_tag(am_config.tag_not_ready)
+        if tag_not_ready not in tags:
+            tags.difference_update(mutually_exclusive_tags)
+            _add_tag(tag_not_ready)
 
-    _sanitize_tags(note)
-
-
-def _remove_exclusive_tags(note: Note, mutually_exclusive_tags: list[str]) -> None:
-    for tag in mutually_exclusive_tags:
-        if tag in note.tags:
-            note.tags.remove(tag)
+    # nothing changed, which is the common case after the first recalc. blank
+    # tags still have to be dropped, like _sanitize_tags does
+    if tags == original_tags_set and all(map(str.strip, original_tags)):
+        return
+
+    updated_tags = [tag for tag in original_tags if tag in tags and tag.strip()]
+    updated_tags.extend(tag for tag in added_tags if tag in tags)
+    if updated_tags != original_tags:
+        note.tags = updated_tags
 
 
 def _sanitize_tags(note: Note) -> None:
-    cleaned = [tag for tag in note.tags if tag and tag.strip()]
-    if len(cleaned) != len(note.tags):
-        note.tags = cleaned
+    # The tags are almost always clean, so only build a new list when needed.
+    # map() keeps the check in C, since stripping a clean tag returns the
+    # same string without copying it.
+    if not all(map(str.strip, note.tags)):
+        note.tags = [tag for tag in note.tags if tag and not tag.isspace()]
 
 
 def update_tags_of_review_cards(
@@ -123,22 +128,38 @@ def update_tags_of_review_cards(
     note: Note,
     has_learning_morphs: bool,
 ) -> None:
-    if am_config.tag_ready in note.tags:
-        note.tags.remove(am_config.tag_ready)
-    elif am_config.tag_not_ready in note.tags:
-        note.tags.remove(am_config.tag_not_ready)
+    tags = note.tags
+    tag_ready = am_config.tag_ready
+    tag_not_ready = am_config.tag_not_ready
+    tag_suspended_automatically = am_config.tag_suspended_automatically
+    tag_fresh = am_config.tag_fresh
+
+    # most review cards are already tagged correctly after the first recalc,
+    # so the tags are only sanitized when something was actually changed
+    dirty = False
 
-    if am_config.tag_suspended_automatically in note.tags:
-        note.tags.remove(am_config.tag_suspended_automatically)
+    if tag_ready in tags:
+        tags.remove(tag_ready)
+        dirty = True
+    elif tag_not_ready in tags:
+        tags.remove(tag_not_ready)
+        dirty = True
+
+    if tag_suspended_automatically in tags:
+        tags.remove(tag_suspended_automatically)
+        dirty = True
 
     if has_learning_morphs:
-        if am_config.tag_fresh not in note.tags:
-            note.tags.append(am_config.tag_fresh)
+        if tag_fresh not in tags:
+            tags.append(tag_fresh)
+            dirty = True
     else:
-        if am_config.tag_fresh in note.tags:
-            note.tags.remove(am_config.tag_fresh)
+        if tag_fresh in tags:
+            tags.remove(tag_fresh)
+            dirty = True
 
-    _sanitize_tags(note)
+    if dirty:
+        _sanitize_tags(note)
 
 
 def reset_am_tags(parent: QWidget) -> None:
@@ -157,7 +178,6 @@ def _reset_am_tags_background_op() -> None:
     assert mw is not None
 
     am_config = PrioritySieveConfig()
-    modified_notes: dict[NoteId, Note] = {}
 
     tags_to_remove = [
         am_config.tag_known_automatically,
@@ -165,21 +185,17 @@ def _reset_am_tags_background_op() -> None:
         am_config.tag_not_ready,
         am_config.tag_fresh,
     ]
-    for tag in tags_to_remove:
-        note_ids: Sequence[NoteId] = mw.col.find_notes(f"tag:{tag}")
-        note_amount = len(note_ids)
-
-        for counter, note_id in enumerate(note_ids):
-            progress_utils.background_update_progress_potentially_cancel(
-                label=f"Removing {tag} tag from notes<br>note: {counter} of {note_amount}",
-                counter=counter,
-                max_value=note_amount,
-                increment=100,
-            )
-            note: Note = modified_notes.get(note_id, mw.col.get_note(note_id))
-            note.tags.remove(tag)
-            modified_notes[note_id] = note
-
-    if modified_notes:
-        note_changes = mw.col.update_notes(list(modified_notes.values()))
-        notify_op_execution(note_changes)
+
+    # a single search and a single backend call for all the tags, instead of
+    # loading and updating every note individually
+    note_ids: Sequence[NoteId] = mw.col.find_notes(
+        " OR ".join(f"tag:{tag}" for tag in tags_to_remove)
+    )
+    if not note_ids:
+        return
+
+    progress_utils.background_update_progress(
+        label=f"Removing tags from {len(note_ids)} notes"
+    )
+    tag_changes = mw.col.tags.bulk_remove(note_ids, " ".join(tags_to_remove))
+    notify_op_execution(tag_changes)
@@ -1,8 +1,17 @@
+from __future__ import annotations
+
+import os
 import sqlite3
 
 from .prioritysieve_config import PrioritySieveConfig
 from .prioritysieve_db import PrioritySieveDB
 
+# The toolbar is redrawn far more often than the morphs change, so the last
+# result is reused as long as the db file hasn't been written to since.
+# (db path, file modification time, file size, learning interval)
+_StatsCacheKey = tuple[str, int, int, int]
+_stats_cache: tuple[_StatsCacheKey, str, str] | None = None
+
 
 class MorphToolbarStats:
     def __init__(self) -> None:
@@ -11,44 +20,61 @@ class MorphToolbarStats:
         self.update_stats()
 
     def update_stats(self) -> None:
+        global _stats_cache
+
         try:
-            am_db = PrioritySieveDB()
+            db_path = PrioritySieveDB.get_default_db_path()
         except TypeError:
             # The toolbar initiates before the profile,
             # when this happens, the path to the db can't
             # be found, and we get a type error.
             return
 
-        # this is only reached after the profile is loaded
-        am_db.create_morph_table()
         am_config = PrioritySieveConfig()
         learning_interval: int = 1  # seen morphs
 
         if am_config.toolbar_stats_use_known:
             learning_interval = am_config.interval_for_known_morphs
 
+        # the file is checked before connecting, so a cache hit doesn't have
+        # to open the db or run the table creation statements
+        cache_key: _StatsCacheKey | None = None
         try:
-            known_lemmas = am_db.con.execute(
-                """
-                SELECT COUNT(DISTINCT lemma)
-                FROM Morphs
-                WHERE highest_inflection_learning_interval >= ?
-                """,
-                (learning_interval,),
-            ).fetchone()[0]
+            db_stat = os.stat(db_path)
+        except FileNotFoundError:
+            pass
+        else:
+            cache_key = (
+                str(db_path),
+                db_stat.st_mtime_ns,
+                db_stat.st_size,
+                learning_interval,
+            )
+            if _stats_cache is not None and _stats_cache[0] == cache_key:
+                _, self.lemmas, self.variants = _stats_cache
+                return
+
+        am_db = PrioritySieveDB(db_path)
+        # this is only reached after the profile is loaded
+        am_db.create_morph_table()
 
-            known_variants = am_db.con.execute(
+        # both counts share the same predicate, so a single scan covers them
+        try:
+            known_lemmas, known_variants = am_db.con.execute(
                 """
-                SELECT COUNT(*)
+                SELECT COUNT(DISTINCT lemma), COUNT(*)
                 FROM Morphs
                 WHERE highest_inflection_learning_interval >= ?
                 """,
                 (learning_interval,),
-            ).fetchone()[0]
-            am_db.con.close()
+            ).fetchone()
         except sqlite3.OperationalError:
             # database schema has changed
             return
+        finally:
+            am_db.con.close()
 
         self.lemmas = f"L: {known_lemmas}"
         self.variants = f"V: {known_variants}"
+        if cache_key is not None:
+            _stats_cache = (cache_key, self.lemmas, self.variants)
@@ -7,3 +7,8 @@ class FakeDB(PrioritySieveDB):
     # We subclass to use a db with a different file name
     def __init__(self) -> None:
         super().__init__(db_path=PATH_DB_COPY)
+        # the db is a throwaway copy made for every test, so it does not have
+        # to survive crashes and can skip the journal file and the fsyncs
+        self.con.execute("PRAGMA journal_mode=MEMORY")
+        self.con.execute("PRAGMA synchronous=OFF")
+        self.con.execute("PRAGMA temp_store=MEMORY")
@@ -13,6 +13,13 @@ class DummyDB:
     def get_card_morph_map_cache(self) -> dict[int, list[Morpheme]]:
         return self._morphs
 
+    def get_card_morph_lemmas_and_readings(self) -> set[tuple[str, str]]:
+        return {
+            (morph.lemma, morph.reading or "")
+            for morphs in self._morphs.values()
+            for morph in morphs
+        }
+
 
 @pytest.fixture
 def dummy_db() -> DummyDB:
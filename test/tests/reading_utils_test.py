@@ -33,3 +33,17 @@ def test_parse_furigana_field_prefixed_kana_duplication() -> None:
 def test_parse_furigana_field_prefixed_kana_duplication_phrase() -> None:
     assert parse_furigana_field("あの世[あのよ]") == ["あのよ"]
 
+def test_normalize_reading_keeps_katakana_without_hiragana_counterpart() -> None:
+    assert normalize_reading("ヷヸヹヺ") == "ヷヸヹヺ"
+
+def test_normalize_reading_small_ka_and_ke() -> None:
+    assert normalize_reading("ヵヶ") == "ゕゖ"
+
+def test_parse_furigana_field_nested_brackets() -> None:
+    # whitespace inside the outer brackets doesn't end the token
+    assert parse_furigana_field("a[b [c d] e] f") == ["ab [c d e]", "f"]
+
+def test_parse_furigana_field_unclosed_bracket() -> None:
+    # an unclosed bracket runs to the end of the text and is kept as is
+    assert parse_furigana_field("x[y z") == ["x[y z"]
+
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from collections import OrderedDict
-from collections.abc import Sequence
+from collections import defaultdict
+from dataclasses import dataclass
+from operator import itemgetter
 from types import SimpleNamespace
 from test.fake_configs import (
     config_big_japanese_collection,
@@ -33,7 +34,6 @@ from prioritysieve import prioritysieve_globals as am_globals
 from prioritysieve import tags_and_queue_utils
 from prioritysieve import text_preprocessing
 from prioritysieve.prioritysieve_config import PrioritySieveConfig, RawConfigFilterKeys
-from prioritysieve.prioritysieve_db import PrioritySieveDB
 from prioritysieve.exceptions import (
     AnkiFieldNotFound,
     AnkiNoteTypeNotFound,
@@ -47,12 +47,11 @@ from prioritysieve.recalc.card_score import _MAX_SCORE
 from prioritysieve.recalc.card_morphs_metrics import CardMorphsMetrics
 
 # these have to be placed here to avoid cyclical imports
-from anki.cards import Card, CardId  # isort:skip  pylint:disable=wrong-import-order
+from anki.collection import Collection  # isort:skip  pylint:disable=wrong-import-order
 from anki.models import (  # isort:skip pylint:disable=wrong-import-order
     ModelManager,
     NotetypeDict,
 )
-from anki.notes import Note  # isort:skip  pylint:disable=wrong-import-order
 
 
 test_cases_with_success = [
@@ -203,6 +202,8 @@ def test_recalc(  # pylint:disable=too-many-locals
     field_positions = {
         key: field_name_dict[value][0] for key, value in field_indices.items()
     }
+    checked_positions = tuple(field_positions.values())
+    get_checked_fields = itemgetter(*checked_positions)
 
     read_enabled_config_filters = prioritysieve_config.get_read_enabled_filters()
     modify_enabled_config_filters = prioritysieve_config.get_modify_enabled_filters()
@@ -216,39 +217,59 @@ def test_recalc(  # pylint:disable=too-many-locals
     # pprint(fake_environment_fixture.config)
     # print()
 
-    expected_collection_cards: Sequence[int] = expected_collection.find_cards("")
-    actual_collection_cards: Sequence[int] = actual_collection.find_cards("")
-    assert len(expected_collection_cards) > 0
-    assert len(expected_collection_cards) == len(actual_collection_cards)
+    # one query per table instead of loading every card and note separately,
+    # the snapshots already hold every card id so find_cards is not needed
+    actual_snapshot = _load_card_note_snapshot(actual_collection)
+    expected_snapshot = _load_card_note_snapshot(expected_collection)
+    assert len(expected_snapshot) > 0
+    assert len(expected_snapshot) == len(actual_snapshot)
 
-    for card_id in expected_collection_cards:
+    for card_id, expected_card in expected_snapshot.items():
         # print(f"card_id: {card_id}")
-        card_id = CardId(card_id)
 
-        actual_card: Card = actual_collection.get_card(card_id)
-        actual_note: Note = actual_card.note()
-
-        expected_card: Card = expected_collection.get_card(card_id)
-        expected_note: Note = expected_card.note()
+        assert card_id in actual_snapshot
+        actual_due, actual_fields, actual_tags = actual_snapshot[card_id]
+        expected_due, expected_fields, expected_tags = expected_card
 
         # for field, pos in field_positions.items():
         #     print()
         #     print(f"field: {field}")
-        #     print(f"actual_note: {actual_note.fields[pos]}")
-        #     print(f"expected_note: {expected_note.fields[pos]}")
-
-        # print(f"actual_card.due: {actual_card.due}")
-        # print(f"expected_card.due: {expected_card.due}")
-        # print(f"actual_note.tags: {actual_note.tags}")
-        # print(f"expected_note.tags: {expected_note.tags}")
-
-        assert card_id == actual_card.id
-        assert actual_card.due == expected_card.due
-        assert actual_note.tags == expected_note.tags
+        #     print(f"actual_fields: {actual_fields[pos]}")
+        #     print(f"expected_fields: {expected_fields[pos]}")
+
+        # print(f"actual_due: {actual_due}")
+        # print(f"expected_due: {expected_due}")
+        # print(f"actual_tags: {actual_tags}")
+        # print(f"expected_tags: {expected_tags}")
+
+        assert actual_due == expected_due
+        assert actual_tags == expected_tags
+
+        # the fields are compared in one go, the loop only runs on a mismatch
+        # so the assertion still points at the field that differs
+        if get_checked_fields(actual_fields) != get_checked_fields(expected_fields):
+            for pos in checked_positions:
+                # fields[pos]: the content of the field
+                assert actual_fields[pos] == expected_fields[pos]
+
+
+def _load_card_note_snapshot(
+    collection: Collection,
+) -> dict[int, tuple[int, list[str], list[str]]]:
+    """Map every card id to its due value and the fields and tags of its note."""
+    assert collection.db is not None
+
+    notes: dict[int, tuple[list[str], list[str]]] = {
+        note_id: (fields.split("\x1f"), tags.split())
+        for note_id, fields, tags in collection.db.all(
+            "SELECT id, flds, tags FROM notes"
+        )
+    }
 
-        for pos in field_positions.values():
-            # note.fields[pos]: the content of the field
-            assert actual_note.fields[pos] == expected_note.fields[pos]
+    return {
+        card_id: (due, *notes[note_id])
+        for card_id, note_id, due in collection.db.all("SELECT id, nid, due FROM cards")
+    }
 
 
 @pytest.mark.external_morphemizers
@@ -284,17 +305,14 @@ def test_recalc_auto_suspends_duplicate_cards(
     am_config = PrioritySieveConfig()
     auto_tag = am_config.tag_suspended_automatically
 
-    am_db = PrioritySieveDB()
-    try:
-        card_morph_map_cache = am_db.get_card_morph_map_cache()
-    finally:
-        am_db.con.close()
+    # the fixture's db is already open on the copy that recalc wrote to
+    card_morph_map_cache = fake_environment_fixture.mock_db.get_card_morph_map_cache()
 
     assert card_morph_map_cache
 
     collection = fake_environment_fixture.actual_collection
 
-    morph_to_cards: dict[tuple[str, str, str], list[int]] = {}
+    morph_to_cards: defaultdict[tuple[str, str, str], list[int]] = defaultdict(list)
     for card_id in card_morph_map_cache:
         unknown_keys = CardMorphsMetrics.get_unknown_morph_keys(
             card_morph_map_cache=card_morph_map_cache,
@@ -303,7 +321,7 @@ def test_recalc_auto_suspends_duplicate_cards(
         if len(unknown_keys) != 1:
             continue
         key = next(iter(unknown_keys))
-        morph_to_cards.setdefault(key, []).append(card_id)
+        morph_to_cards[key].append(card_id)
 
     assert any(len(card_ids) > 1 for card_ids in morph_to_cards.values())
 
@@ -501,16 +519,46 @@ def test_recalc_with_invalid_known_morphs_file(  # pylint:disable=unused-argumen
         )
 
 
+@dataclass(slots=True)
+class FakeCard:
+    id: int
+    did: int
+    nid: int
+    due: int
+    queue: int
+
+
+@dataclass(slots=True)
+class FakeNote:
+    id: int
+    fields: list[str]
+    tags: list[str]
+
+
+class FakeNotesDB:
+    """Answers the tags query _apply_offsets runs for notes that aren't loaded."""
+
+    def __init__(self, notes: dict[int, FakeNote]) -> None:
+        self._notes = notes
+        self.queried_note_ids: list[int] = []
+
+    def scalar(self, sql: str, note_id: int) -> str | None:
+        assert sql == "SELECT tags FROM notes WHERE id = ?"
+        self.queried_note_ids.append(note_id)
+        note = self._notes.get(note_id)
+        return f" {' '.join(note.tags)} " if note is not None else None
+
+
 def test_add_offsets_priority_deck(monkeypatch: pytest.MonkeyPatch) -> None:
     cards = {
-        1: SimpleNamespace(id=1, did=10, nid=101, due=10, queue=0),
-        2: SimpleNamespace(id=2, did=20, nid=102, due=50, queue=0),
-        3: SimpleNamespace(id=3, did=30, nid=103, due=20, queue=0),
+        1: FakeCard(id=1, did=10, nid=101, due=10, queue=0),
+        2: FakeCard(id=2, did=20, nid=102, due=50, queue=0),
+        3: FakeCard(id=3, did=30, nid=103, due=20, queue=0),
     }
     notes = {
-        101: SimpleNamespace(id=101, fields=[""], tags=[]),
-        102: SimpleNamespace(id=102, fields=[""], tags=[]),
-        103: SimpleNamespace(id=103, fields=[""], tags=[]),
+        101: FakeNote(id=101, fields=[""], tags=[]),
+        102: FakeNote(id=102, fields=[""], tags=[]),
+        103: FakeNote(id=103, fields=[""], tags=[]),
     }
     deck_map = {
         10: {"name": "OtherDeck"},
@@ -529,6 +577,7 @@ def test_add_offsets_priority_deck(monkeypatch: pytest.MonkeyPatch) -> None:
         get_card=lambda card_id: cards[card_id],
         get_note=lambda note_id: notes[note_id],
         decks=FakeDecks(deck_map),
+        db=FakeNotesDB(notes),
     )
     fake_mw = SimpleNamespace(col=fake_col)
 
@@ -544,7 +593,9 @@ def test_add_offsets_priority_deck(monkeypatch: pytest.MonkeyPatch) -> None:
         lambda *args, **kwargs: None,
     )
 
-    def _fake_unknowns(_card_morph_map_cache: dict[int, object], card_id: int) -> set[str]:
+    def _fake_unknowns(
+        card_morph_map_cache: dict[int, object], card_id: int
+    ) -> set[str]:
         return {"shared-morph"} if card_id in cards else set()
 
     monkeypatch.setattr(
@@ -559,7 +610,7 @@ def test_add_offsets_priority_deck(monkeypatch: pytest.MonkeyPatch) -> None:
         tag_suspended_automatically=auto_tag,
     )
 
-    handled_cards = OrderedDict((card_id, None) for card_id in cards)
+    handled_cards = dict(cards)
     modified_notes: dict[int, object] = {}
     note_original_state: dict[int, tuple[list[str], list[str]]] = {}
 
@@ -570,6 +621,7 @@ def test_add_offsets_priority_deck(monkeypatch: pytest.MonkeyPatch) -> None:
         handled_cards=handled_cards,
         modified_notes=modified_notes,
         note_original_state=note_original_state,
+        notes_cache={},
     )
 
     assert cards[2].queue != tags_and_queue_utils.suspended
@@ -585,20 +637,21 @@ def test_add_offsets_priority_deck(monkeypatch: pytest.MonkeyPatch) -> None:
 
 def test_add_offsets_idempotent(monkeypatch: pytest.MonkeyPatch) -> None:
     cards = {
-        1: SimpleNamespace(id=1, did=10, nid=101, due=0, queue=0),
-        2: SimpleNamespace(id=2, did=10, nid=102, due=0, queue=0),
-        3: SimpleNamespace(id=3, did=10, nid=103, due=0, queue=0),
+        1: FakeCard(id=1, did=10, nid=101, due=0, queue=0),
+        2: FakeCard(id=2, did=10, nid=102, due=0, queue=0),
+        3: FakeCard(id=3, did=10, nid=103, due=0, queue=0),
     }
     notes = {
-        101: SimpleNamespace(id=101, fields=[""], tags=[]),
-        102: SimpleNamespace(id=102, fields=[""], tags=[]),
-        103: SimpleNamespace(id=103, fields=[""], tags=[]),
+        101: FakeNote(id=101, fields=[""], tags=[]),
+        102: FakeNote(id=102, fields=[""], tags=[]),
+        103: FakeNote(id=103, fields=[""], tags=[]),
     }
 
     fake_col = SimpleNamespace(
         get_card=lambda card_id: cards[card_id],
         get_note=lambda note_id: notes[note_id],
         decks=SimpleNamespace(get=lambda *_args, **_kwargs: None),
+        db=FakeNotesDB(notes),
     )
     fake_mw = SimpleNamespace(col=fake_col)
 
@@ -617,7 +670,9 @@ def test_add_offsets_idempotent(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         recalc_main.CardMorphsMetrics,
         "get_unknown_morph_keys",
-        lambda _cache, card_id: {"shared-morph"} if card_id in cards else set(),
+        lambda card_morph_map_cache, card_id: (
+            {"shared-morph"} if card_id in cards else set()
+        ),
     )
 
     auto_tag = "auto-tag"
@@ -626,7 +681,7 @@ def test_add_offsets_idempotent(monkeypatch: pytest.MonkeyPatch) -> None:
         tag_suspended_automatically=auto_tag,
     )
 
-    handled_cards = OrderedDict((card_id, None) for card_id in cards)
+    handled_cards = dict(cards)
     modified_notes: dict[int, object] = {}
     note_original_state: dict[int, tuple[list[str], list[str]]] = {}
 
@@ -637,6 +692,7 @@ def test_add_offsets_idempotent(monkeypatch: pytest.MonkeyPatch) -> None:
         handled_cards=handled_cards,
         modified_notes=modified_notes,
         note_original_state=note_original_state,
+        notes_cache={},
     )
 
     for card_id in (2, 3):
@@ -646,20 +702,31 @@ def test_add_offsets_idempotent(monkeypatch: pytest.MonkeyPatch) -> None:
         assert auto_tag in note.tags
         assert card.due == _MAX_SCORE
 
-    handled_cards_second = OrderedDict((card_id, None) for card_id in cards)
+    states_after_first = {
+        card_id: (card.due, card.queue) for card_id, card in cards.items()
+    }
+    tags_after_first = {note_id: list(note.tags) for note_id, note in notes.items()}
+
+    handled_cards_second = dict(cards)
     modified_notes_second: dict[int, object] = {}
     note_original_state_second: dict[int, tuple[list[str], list[str]]] = {}
 
-    result_second = recalc_main._add_offsets_to_new_cards(
+    recalc_main._add_offsets_to_new_cards(
         am_config=am_config,
         card_morph_map_cache={},
         already_modified_cards={},
         handled_cards=handled_cards_second,
         modified_notes=modified_notes_second,
         note_original_state=note_original_state_second,
+        notes_cache={},
     )
 
-    assert result_second == {}
+    # the returned dict also holds the unchanged base cards, so the card
+    # states themselves are compared
+    assert {
+        card_id: (card.due, card.queue) for card_id, card in cards.items()
+    } == states_after_first
+    assert {note_id: note.tags for note_id, note in notes.items()} == tags_after_first
     assert modified_notes_second == {}
 
 
@@ -695,23 +762,23 @@ def test_update_tags_auto_suspend_override() -> None:
 def test_force_auto_suspend_survives_offset(monkeypatch: pytest.MonkeyPatch) -> None:
     auto_tag = "auto-tag"
     original_tags = ["foo", auto_tag, "bar"]
-    card = SimpleNamespace(
+    card = FakeCard(
         id=1,
         nid=1,
         did=10,
         due=_MAX_SCORE,
         queue=tags_and_queue_utils.suspended,
     )
-    note = SimpleNamespace(id=1, tags=list(original_tags), fields=[])
+    note = FakeNote(id=1, fields=[], tags=list(original_tags))
 
     class FakeCol:
         @staticmethod
-        def get_card(card_id: int) -> SimpleNamespace:
+        def get_card(card_id: int) -> FakeCard:
             assert card_id == card.id
             return card
 
         @staticmethod
-        def get_note(note_id: int) -> SimpleNamespace:
+        def get_note(note_id: int) -> FakeNote:
             assert note_id == note.id
             return note
 
@@ -738,6 +805,8 @@ def test_force_auto_suspend_survives_offset(monkeypatch: pytest.MonkeyPatch) ->
         cards_with_morph=cards_with,
         modified_notes=modified_notes,
         note_original_state=note_original_state,
+        handled_cards={card.id: card},
+        notes_cache={},
     )
 
     assert card.queue == tags_and_queue_utils.suspended
@@ -746,6 +815,70 @@ def test_force_auto_suspend_survives_offset(monkeypatch: pytest.MonkeyPatch) ->
     assert note.tags == original_tags
 
 
+def test_apply_offsets_checks_base_note_tags(monkeypatch: pytest.MonkeyPatch) -> None:
+    auto_tag = "auto-tag"
+    # 1: tagged, only in the db; 2: untagged, only in the db; 3: tagged, loaded
+    cards = {
+        card_id: FakeCard(
+            id=card_id,
+            did=10,
+            nid=100 + card_id,
+            due=5,
+            queue=tags_and_queue_utils.suspended,
+        )
+        for card_id in (1, 2, 3)
+    }
+    notes = {
+        101: FakeNote(id=101, fields=[""], tags=["foo", auto_tag]),
+        102: FakeNote(id=102, fields=[""], tags=["foo"]),
+        103: FakeNote(id=103, fields=[""], tags=[auto_tag, "bar"]),
+    }
+    loaded_note_ids: list[int] = []
+    fake_db = FakeNotesDB(notes)
+
+    def _get_note(note_id: int) -> FakeNote:
+        loaded_note_ids.append(note_id)
+        return notes[note_id]
+
+    fake_col = SimpleNamespace(get_note=_get_note, db=fake_db)
+    monkeypatch.setattr(recalc_main, "mw", SimpleNamespace(col=fake_col))
+
+    am_config = SimpleNamespace(tag_suspended_automatically=auto_tag)
+    morphs = {card_id: (f"m{card_id}", f"m{card_id}", "") for card_id in cards}
+    modified_notes: dict[int, FakeNote] = {}
+
+    modified_cards = recalc_main._apply_offsets(
+        am_config=am_config,
+        already_modified_cards={},
+        earliest_due_card_for_unknown_morph={
+            morphs[card_id]: card for card_id, card in cards.items()
+        },
+        cards_with_morph={morphs[card_id]: {card_id} for card_id in cards},
+        modified_notes=modified_notes,
+        note_original_state={},
+        handled_cards=dict(cards),
+        notes_cache={103: notes[103]},
+    )
+
+    # the tag is checked in the db, the note is only loaded to remove it
+    assert notes[101].tags == ["foo"]
+    assert cards[1].queue == 0
+    assert 101 in modified_notes
+
+    # without the tag the note is never loaded and the card stays suspended
+    assert notes[102].tags == ["foo"]
+    assert cards[2].queue == tags_and_queue_utils.suspended
+    assert 2 not in modified_cards
+    assert 102 not in modified_notes
+
+    # an already loaded note is used as is instead of querying the db
+    assert notes[103].tags == ["bar"]
+    assert cards[3].queue == 0
+
+    assert loaded_note_ids == [101]
+    assert fake_db.queried_note_ids == [101, 102]
+
+
 def test_update_tags_of_review_cards_removes_auto_tag() -> None:
     am_config = SimpleNamespace(
         tag_ready="ready",
@@ -10,63 +10,78 @@ from typing import Any, Iterator
 import pytest
 
 
-def _bootstrap_minimal_environment() -> None:
-    if "prioritysieve" not in sys.modules:
-        package_root = Path(__file__).resolve().parents[2] / "prioritysieve"
-        package_module = ModuleType("prioritysieve")
-        package_module.__path__ = [str(package_root)]  # type: ignore[attr-defined]
-        sys.modules["prioritysieve"] = package_module
+# set once the stubs below are installed, so importing this test module
+# again in the same process skips the bootstrap
+_BOOTSTRAP_SENTINEL = "prioritysieve.__test_bootstrap__"
 
-    if "prioritysieve.prioritysieve_config" not in sys.modules:
-        config_module = ModuleType("prioritysieve.prioritysieve_config")
 
-        class _StubConfig:  # pylint:disable=too-few-public-methods
-            def __init__(self, *_, **__) -> None:  # noqa: D401
-                pass
+class _StubConfig:  # pylint:disable=too-few-public-methods
+    def __init__(self, *_, **__) -> None:  # noqa: D401
+        pass
 
-        config_module.PrioritySieveConfig = _StubConfig  # type: ignore[attr-defined]
-        config_module.RawConfigKeys = SimpleNamespace()  # type: ignore[attr-defined]
-        config_module.update_configs = lambda _cfg: None  # type: ignore[attr-defined]
-        sys.modules["prioritysieve.prioritysieve_config"] = config_module
 
-    if "aqt" not in sys.modules:
-        aqt_module = ModuleType("aqt")
-        aqt_module.mw = None  # type: ignore[attr-defined]
-        package_module = ModuleType("aqt.package")
+def _venv_binary(_: str) -> str | None:  # pylint:disable=unused-argument
+    return None
+
+
+def _is_win() -> bool:
+    return sys.platform.startswith("win")
 
-        def _venv_binary(_: str) -> str | None:  # pylint:disable=unused-argument
-            return None
 
-        package_module.venv_binary = _venv_binary  # type: ignore[attr-defined]
+def _fake_module(name: str, **attributes: Any) -> ModuleType:
+    module = ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def _bootstrap_minimal_environment() -> None:
+    if sys.modules.get(_BOOTSTRAP_SENTINEL) is not None:
+        return
+
+    if "prioritysieve" not in sys.modules:
+        package_root = Path(__file__).resolve().parents[2] / "prioritysieve"
+        _fake_module("prioritysieve", __path__=[str(package_root)])
+
+    if "prioritysieve.prioritysieve_config" not in sys.modules:
+        _fake_module(
+            "prioritysieve.prioritysieve_config",
+            PrioritySieveConfig=_StubConfig,
+            RawConfigKeys=SimpleNamespace(),
+            update_configs=lambda _cfg: None,
+        )
 
-        sys.modules["aqt"] = aqt_module
-        sys.modules["aqt.package"] = package_module
+    if "aqt" not in sys.modules:
+        _fake_module("aqt", mw=None)
+        _fake_module("aqt.package", venv_binary=_venv_binary)
 
     if "anki" not in sys.modules:
         try:
             importlib.import_module("anki")
         except ModuleNotFoundError:
-            anki_module = ModuleType("anki")
-            utils_module = ModuleType("anki.utils")
+            utils_module = _fake_module("anki.utils", is_win=_is_win)
+            _fake_module("anki", utils=utils_module)
 
-            def _is_win() -> bool:
-                return sys.platform.startswith("win")
-
-            utils_module.is_win = _is_win  # type: ignore[attr-defined]
-            anki_module.utils = utils_module  # type: ignore[attr-defined]
-            sys.modules["anki"] = anki_module
-            sys.modules["anki.utils"] = utils_module
+    sys.modules[_BOOTSTRAP_SENTINEL] = sys.modules["prioritysieve"]
 
 
 _bootstrap_minimal_environment()
 
+# these have to be imported after the bootstrap above
+from prioritysieve.exceptions import CancelledOperationException
+from prioritysieve.morpheme import Morpheme
+from prioritysieve.morphemizers import morphemizer_utils, spacy_wrapper, sudachi_wrapper
+from prioritysieve.morphemizers.sudachi_morphemizer import SudachiMorphemizer
+
 
 class _FakeSudachiMorpheme:
+    __slots__ = ("_surface", "_lemma", "_part_of_speech")
+
     def __init__(self, surface: str, lemma: str, pos: str, sub_pos: str) -> None:
         self._surface = surface
         self._lemma = lemma
-        self._pos = pos
-        self._sub_pos = sub_pos
+        # sudachi_wrapper asks for the part of speech more than once per token
+        self._part_of_speech = (pos, sub_pos, "*", "*", "*", "*")
 
     def surface(self) -> str:
         return self._surface
@@ -75,7 +90,23 @@ class _FakeSudachiMorpheme:
         return self._lemma
 
     def part_of_speech(self) -> tuple[str, str, str, str, str, str]:
-        return (self._pos, self._sub_pos, "*", "*", "*", "*")
+        return self._part_of_speech
+
+
+# the fake tokenizer output never changes, so the morphemes are built once
+_MODE_A_MORPHS = (
+    _FakeSudachiMorpheme("す", "す", "名詞", "普通名詞"),
+    _FakeSudachiMorpheme("だち", "だち", "名詞", "普通名詞"),
+    _FakeSudachiMorpheme("が", "が", "助詞", "格助詞"),
+    _FakeSudachiMorpheme("好き", "好き", "形容詞", "一般"),
+    _FakeSudachiMorpheme("です", "です", "助動詞", "*"),
+)
+_MODE_C_MORPHS = (
+    _FakeSudachiMorpheme("すだち", "すだち", "名詞", "普通名詞"),
+    _FakeSudachiMorpheme("が", "が", "助詞", "格助詞"),
+    _FakeSudachiMorpheme("好き", "好き", "形容詞", "一般"),
+    _FakeSudachiMorpheme("です", "です", "助動詞", "*"),
+)
 
 
 class _FakeSudachiTokenizer:
@@ -94,20 +125,9 @@ class _FakeSudachiTokenizer:
         _FakeSudachiTokenizer.last_variant = self.variant
 
         if mode == self.SplitMode.A:
-            return [
-                _FakeSudachiMorpheme("す", "す", "名詞", "普通名詞"),
-                _FakeSudachiMorpheme("だち", "だち", "名詞", "普通名詞"),
-                _FakeSudachiMorpheme("が", "が", "助詞", "格助詞"),
-                _FakeSudachiMorpheme("好き", "好き", "形容詞", "一般"),
-                _FakeSudachiMorpheme("です", "です", "助動詞", "*"),
-            ]
-
-        return [
-            _FakeSudachiMorpheme("すだち", "すだち", "名詞", "普通名詞"),
-            _FakeSudachiMorpheme("が", "が", "助詞", "格助詞"),
-            _FakeSudachiMorpheme("好き", "好き", "形容詞", "一般"),
-            _FakeSudachiMorpheme("です", "です", "助動詞", "*"),
-        ]
+            return list(_MODE_A_MORPHS)
+
+        return list(_MODE_C_MORPHS)
 
 
 class _FakeSudachiDictionary:
@@ -121,88 +141,103 @@ class _FakeSudachiDictionary:
         return _FakeSudachiTokenizer(self._variant)
 
 
-@pytest.fixture()
-def sudachi_stub_environment(
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
-) -> Iterator[None]:
-    packages_path = tmp_path / "sudachi_pkgs"
-    packages_path.mkdir()
+class _FakeProcess:
+    terminated = False
+
+    def __init__(self, cmd: list[str]) -> None:
+        self.cmd = cmd
+
+    def __enter__(self) -> _FakeProcess:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        pass
+
+    def wait(self, timeout: float | None = None) -> int:
+        if timeout is not None and not self.terminated:
+            raise subprocess.TimeoutExpired(self.cmd, timeout)
+        return -15
+
+    def terminate(self) -> None:
+        self.terminated = True
+
+
+_SUDACHI_MODULE_NAMES = frozenset(
+    {"sudachipy", "sudachipy.dictionary", "sudachipy.tokenizer"}
+)
+
+
+@pytest.fixture(scope="module")
+def _sudachi_stub_modules(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Iterator[Path]:
+    # nothing changes the stubs between tests, so they are only built once
+    packages_path = tmp_path_factory.mktemp("sudachi_pkgs")
     (packages_path / "sudachidict_core").mkdir()
     (packages_path / "sudachidict_full").mkdir()
 
-    sudachi_module = ModuleType("sudachipy")
-    dictionary_module = ModuleType("dictionary")
-    dictionary_module.Dictionary = _FakeSudachiDictionary
-    tokenizer_module = ModuleType("tokenizer")
-    tokenizer_module.Tokenizer = _FakeSudachiTokenizer
-    sudachi_module.dictionary = dictionary_module
-    sudachi_module.tokenizer = tokenizer_module
-
-    original_modules = {
-        "sudachipy": sys.modules.get("sudachipy"),
-        "sudachipy.dictionary": sys.modules.get("sudachipy.dictionary"),
-        "sudachipy.tokenizer": sys.modules.get("sudachipy.tokenizer"),
+    modules_to_restore = {
+        name: sys.modules[name] for name in _SUDACHI_MODULE_NAMES if name in sys.modules
     }
+    modules_to_remove = _SUDACHI_MODULE_NAMES - modules_to_restore.keys()
 
-    sys.modules["sudachipy"] = sudachi_module
-    sys.modules["sudachipy.dictionary"] = dictionary_module
-    sys.modules["sudachipy.tokenizer"] = tokenizer_module
-
-    from prioritysieve.morphemizers import morphemizer_utils, spacy_wrapper, sudachi_wrapper
-
-    importlib.reload(sudachi_wrapper)
-    monkeypatch.setattr(morphemizer_utils, "sudachi_wrapper", sudachi_wrapper, raising=False)
+    dictionary_module = _fake_module(
+        "sudachipy.dictionary", Dictionary=_FakeSudachiDictionary
+    )
+    tokenizer_module = _fake_module(
+        "sudachipy.tokenizer", Tokenizer=_FakeSudachiTokenizer
+    )
+    _fake_module("sudachipy", dictionary=dictionary_module, tokenizer=tokenizer_module)
 
-    sudachi_wrapper.testing_environment = True
     spacy_wrapper.testing_environment = True
-    sudachi_wrapper.set_packages_path_override(packages_path)
-    sudachi_wrapper.invalidate_cache()
 
-    yield
+    yield packages_path
 
-    sudachi_wrapper.set_packages_path_override(None)
-    sudachi_wrapper.invalidate_cache()
     spacy_wrapper.testing_environment = False
 
-    for module_name, module in original_modules.items():
-        if module is None:
-            sys.modules.pop(module_name, None)
-        else:
-            sys.modules[module_name] = module
+    sys.modules.update(modules_to_restore)
+    for module_name in modules_to_remove:
+        sys.modules.pop(module_name, None)
 
-    sys.modules.pop("sudachipy", None)
-    sys.modules.pop("sudachipy.dictionary", None)
-    sys.modules.pop("sudachipy.tokenizer", None)
 
+@pytest.fixture()
+def sudachi_stub_environment(
+    _sudachi_stub_modules: Path,
+) -> Iterator[None]:
+    _FakeSudachiTokenizer.last_mode = None
+    _FakeSudachiTokenizer.last_sentence = None
+    _FakeSudachiTokenizer.last_variant = None
 
-from prioritysieve.morpheme import Morpheme
-from prioritysieve.morphemizers import morphemizer_utils, sudachi_wrapper
-from prioritysieve.morphemizers.sudachi_morphemizer import SudachiMorphemizer
-
+    sudachi_wrapper.testing_environment = True
+    # the other tests reset the override, so it is set again for every test.
+    # this also invalidates the cache, which makes the wrapper import the
+    # stubs lazily without having to reload it
+    sudachi_wrapper.set_packages_path_override(_sudachi_stub_modules)
 
-def _get_surfaces(morphs: list[Morpheme]) -> list[str]:
-    return [morph.inflection for morph in morphs]
+    yield
 
+    sudachi_wrapper.set_packages_path_override(None)
 
-@pytest.mark.usefixtures("sudachi_stub_environment")
-def test_sudachi_morpheme_generation_default_variant() -> None:
-    morphemizer = SudachiMorphemizer("core", "C")
-    assert morphemizer.init_successful()
 
-    sentence = "すだちが好きです"
-    morphs = next(morphemizer.get_morphemes([sentence]))
-    assert _get_surfaces(morphs) == ["すだち", "が", "好き", "です"]
+def _get_surfaces(morphs: list[Morpheme]) -> list[str]:
+    return [morph.inflection for morph in morphs]
 
 
+@pytest.mark.parametrize(
+    "split_mode, expected_surfaces",
+    [
+        ("C", ["すだち", "が", "好き", "です"]),
+        ("A", ["す", "だち", "が", "好き", "です"]),
+    ],
+)
 @pytest.mark.usefixtures("sudachi_stub_environment")
-def test_sudachi_split_mode_controls_tokenization() -> None:
-    morphemizer = SudachiMorphemizer("core", "A")
+def test_sudachi_split_mode(split_mode: str, expected_surfaces: list[str]) -> None:
+    morphemizer = SudachiMorphemizer("core", split_mode)
     assert morphemizer.init_successful()
 
     sentence = "すだちが好きです"
     morphs = next(morphemizer.get_morphemes([sentence]))
-    assert _get_surfaces(morphs) == ["す", "だち", "が", "好き", "です"]
+    assert _get_surfaces(morphs) == expected_surfaces
 
 
 @pytest.mark.usefixtures("sudachi_stub_environment")
@@ -215,31 +250,51 @@ def test_available_morphemizers_include_variants() -> None:
     morphemizer_utils.available_morphemizers = None
     morphemizer_utils.morphemizers_by_description.clear()
 
-    descriptions = {
-        morphemizer.get_description(): morphemizer
-        for morphemizer in morphemizer_utils.get_all_morphemizers()
-    }
-
     expected_description = "SudachiPy: Japanese (core, mode C)"
-    assert expected_description in descriptions
+    assert any(
+        morphemizer.get_description() == expected_description
+        for morphemizer in morphemizer_utils.get_all_morphemizers()
+    )
 
 
-def test_install_dictionary_invokes_pip_with_target(
+@pytest.fixture()
+def pip_install_environment(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
-) -> None:
+) -> Iterator[Path]:
+    # the state is reset in the teardown so it is also restored when a test fails
+    packages_path = tmp_path / "sudachi_pkgs"
     sudachi_wrapper.testing_environment = False
-    sudachi_wrapper.set_packages_path_override(tmp_path / "sudachi_pkgs")
-
-    commands: list[list[str]] = []
+    sudachi_wrapper.set_packages_path_override(packages_path)
 
     monkeypatch.setattr(sudachi_wrapper, "_get_python_binary", lambda: "python-bin")
 
+    yield packages_path
+
+    sudachi_wrapper.testing_environment = True
+    sudachi_wrapper.set_packages_path_override(None)
+
+
+@pytest.fixture()
+def pip_capture(
+    monkeypatch: pytest.MonkeyPatch,
+    pip_install_environment: Path,
+) -> tuple[list[list[str]], Path]:
+    commands: list[list[str]] = []
+
     def _fake_run(cmd: list[str], check: bool) -> None:  # pylint:disable=unused-argument
         commands.append(cmd)
 
     monkeypatch.setattr(subprocess, "run", _fake_run)
 
+    return commands, pip_install_environment
+
+
+def test_install_dictionary_invokes_pip_with_target(
+    pip_capture: tuple[list[list[str]], Path],
+) -> None:
+    commands, packages_path = pip_capture
+
     sudachi_wrapper.install_dictionary("core")
 
     assert commands, "Expected pip install command to be executed"
@@ -251,14 +306,10 @@ def test_install_dictionary_invokes_pip_with_target(
         "install",
         "--upgrade",
         "--target",
-        str(tmp_path / "sudachi_pkgs"),
+        str(packages_path),
     ]
     assert cmd[-1] == "sudachidict-core"
 
-    sudachi_wrapper.testing_environment = True
-    sudachi_wrapper.set_packages_path_override(None)
-    sudachi_wrapper.invalidate_cache()
-
 
 def test_remove_dictionary_deletes_installed_files(tmp_path: Path) -> None:
     packages_path = tmp_path / "sudachi_pkgs"
@@ -273,27 +324,34 @@ def test_remove_dictionary_deletes_installed_files(tmp_path: Path) -> None:
     assert not module_dir.exists()
     assert not dist_dir.exists()
     sudachi_wrapper.set_packages_path_override(None)
-    sudachi_wrapper.invalidate_cache()
 
 
-def test_install_sudachipy_invokes_pip(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    sudachi_wrapper.testing_environment = False
-    sudachi_wrapper.set_packages_path_override(tmp_path / "sudachi_pkgs")
+def test_install_sudachipy_invokes_pip(
+    pip_capture: tuple[list[list[str]], Path],
+) -> None:
+    commands, _packages_path = pip_capture
 
-    commands: list[list[str]] = []
+    sudachi_wrapper.install_sudachipy()
 
-    monkeypatch.setattr(sudachi_wrapper, "_get_python_binary", lambda: "python-bin")
+    assert commands, "Expected pip install command to be executed"
+    assert commands[0][-1] == "sudachipy"
 
-    def _fake_run(cmd: list[str], check: bool) -> None:  # pylint:disable=unused-argument
-        commands.append(cmd)
 
-    monkeypatch.setattr(subprocess, "run", _fake_run)
+@pytest.mark.usefixtures("pip_install_environment")
+def test_install_dictionary_terminates_pip_when_cancelled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    processes: list[_FakeProcess] = []
 
-    sudachi_wrapper.install_sudachipy()
+    def _fake_popen(cmd: list[str]) -> _FakeProcess:
+        process = _FakeProcess(cmd)
+        processes.append(process)
+        return process
 
-    assert commands, "Expected pip install command to be executed"
-    assert commands[0][-1] == "sudachipy"
+    monkeypatch.setattr(subprocess, "Popen", _fake_popen)
 
-    sudachi_wrapper.testing_environment = True
-    sudachi_wrapper.set_packages_path_override(None)
-    sudachi_wrapper.invalidate_cache()
+    with pytest.raises(CancelledOperationException):
+        sudachi_wrapper.install_dictionary("core", should_cancel=lambda: True)
+
+    assert processes and processes[0].terminated
+    assert processes[0].cmd[-1] == "sudachidict-core"
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from prioritysieve import tags_and_queue_utils
+from prioritysieve.recalc.card_score import _MAX_SCORE
+
+
+def _make_config() -> SimpleNamespace:
+    return SimpleNamespace(
+        tag_ready="ready",
+        tag_not_ready="not-ready",
+        tag_known_automatically="known-auto",
+        tag_known_manually="known-manual",
+        tag_fresh="fresh",
+        tag_suspended_automatically="auto-tag",
+    )
+
+
+def _update_new_card(
+    tags: list[str], unknowns: int, force_auto_suspend: bool = False
+) -> tuple[SimpleNamespace, SimpleNamespace]:
+    note = SimpleNamespace(id=1, tags=tags)
+    card = SimpleNamespace(queue=0, nid=note.id, due=42)
+    tags_and_queue_utils.update_tags_and_queue_of_new_card(
+        am_config=_make_config(),
+        note=note,
+        card=card,
+        unknowns=unknowns,
+        has_learning_morphs=False,
+        force_auto_suspend=force_auto_suspend,
+    )
+    return note, card
+
+
+def test_swapped_exclusive_tag_is_appended() -> None:
+    note, _card = _update_new_card(["foo", "ready", "bar"], unknowns=2)
+    assert note.tags == ["foo", "bar", "not-ready"]
+
+
+def test_several_exclusive_tags_are_swapped() -> None:
+    # the other tags keep their order and the new tag goes to the end
+    note, _card = _update_new_card(["known-auto", "foo", "ready", "bar"], unknowns=2)
+    assert note.tags == ["foo", "bar", "not-ready"]
+
+
+def test_kept_exclusive_tag_stays_in_place() -> None:
+    note, _card = _update_new_card(
+        ["foo", "not-ready", "ready", "bar"], unknowns=1, force_auto_suspend=True
+    )
+    assert note.tags == ["foo", "not-ready", "bar", "auto-tag"]
+
+
+def test_known_card_is_tagged_and_suspended() -> None:
+    note, card = _update_new_card(["foo", "not-ready"], unknowns=0)
+    assert note.tags == ["foo", "auto-tag", "known-auto"]
+    assert card.queue == tags_and_queue_utils.suspended
+    assert card.due == _MAX_SCORE
+
+
+def test_unchanged_tags_are_not_reassigned() -> None:
+    tags = ["foo", "ready"]
+    note, _card = _update_new_card(tags, unknowns=1)
+    assert note.tags is tags
+    assert note.tags == ["foo", "ready"]
+
+
+def test_blank_tags_are_removed_when_nothing_else_changed() -> None:
+    note, _card = _update_new_card(["foo", "", "ready", " "], unknowns=1)
+    assert note.tags == ["foo", "ready"]
+
+
+def test_blank_tags_are_removed_with_other_changes() -> None:
+    note, _card = _update_new_card(["", "foo", "ready"], unknowns=2)
+    assert note.tags == ["foo", "not-ready"]